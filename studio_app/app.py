@@ -18,6 +18,7 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+import httpx
 import streamlit as st
 
 # ElevenLabs imports
@@ -114,8 +115,24 @@ class ElevenLabsStudio:
     def initialize_client(self, api_key: str):
         """Initialize ElevenLabs clients with API key"""
         try:
-            self.client = ElevenLabs(api_key=api_key)
-            self.async_client = AsyncElevenLabs(api_key=api_key)
+            # Persistent keep-alive pools so every feature call reuses the
+            # same TLS connections instead of paying a handshake per request
+            self.client = ElevenLabs(
+                api_key=api_key,
+                httpx_client=httpx.Client(
+                    timeout=60.0,
+                    limits=httpx.Limits(max_keepalive_connections=10),
+                    transport=httpx.HTTPTransport(retries=1),
+                ),
+            )
+            self.async_client = AsyncElevenLabs(
+                api_key=api_key,
+                httpx_client=httpx.AsyncClient(
+                    timeout=60.0,
+                    limits=httpx.Limits(max_keepalive_connections=10),
+                    transport=httpx.AsyncHTTPTransport(retries=1),
+                ),
+            )
             st.session_state.client = self.client
             return True
         except Exception as e:
@@ -193,6 +210,14 @@ def main():
                 # Cache voices and models
                 st.session_state.voices = studio.get_voices()
                 st.session_state.models = studio.get_models()
+                # Precompute capability lists once so feature pages don't
+                # re-filter models on every rerun
+                st.session_state.tts_models = [
+                    m for m in st.session_state.models if getattr(m, 'can_do_text_to_speech', False)
+                ]
+                st.session_state.s2s_models = [
+                    m for m in st.session_state.models if getattr(m, 'can_do_voice_conversion', False)
+                ]
                 
                 # Option to save API key to Supabase
                 if SUPABASE_AVAILABLE and st.session_state.get('supabase_user'):
@@ -21,6 +21,42 @@ except ImportError:
     print("❌ ElevenLabs package not installed. Run: pip install elevenlabs")
     sys.exit(1)
 
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """One shared client for all demos, so they reuse the same connection pool"""
+    return ElevenLabs(api_key=os.getenv('ELEVENLABS_API_KEY'))
+
+
+# Resolved demo voice persisted across runs so repeat invocations skip the
+# voice-listing round-trip entirely
+VOICE_CACHE_PATH = os.path.expanduser("~/.cache/elevenlabs_voices.json")
+
+
+def load_cached_voice():
+    """Return (name, voice_id) from the on-disk cache, or (None, None)"""
+    import json
+    try:
+        with open(VOICE_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        return cached.get('name'), cached.get('voice_id')
+    except (OSError, ValueError):
+        return None, None
+
+
+def store_cached_voice(name, voice_id):
+    """Persist the resolved demo voice for subsequent runs"""
+    import json
+    try:
+        os.makedirs(os.path.dirname(VOICE_CACHE_PATH), exist_ok=True)
+        with open(VOICE_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'name': name, 'voice_id': voice_id}, f)
+    except OSError:
+        pass
+
+
 def demo_text_to_speech():
     """Demonstrate text-to-speech functionality"""
     print("\n🎵 Text-to-Speech Demo")
@@ -33,24 +69,32 @@ def demo_text_to_speech():
         return
     
     try:
-        client = ElevenLabs(api_key=api_key)
-        
-        # Get available voices
-        print("📋 Fetching available voices...")
-        voices_response = client.voices.search()
-        voices = voices_response.voices
-        print(f"✅ Found {len(voices)} voices")
-        
-        # Show first few voices
-        for i, voice in enumerate(voices[:3]):
-            print(f"  {i+1}. {voice.name} (ID: {voice.voice_id})")
-        
-        # Generate speech with first voice
-        if voices:
-            voice = voices[0]
+        client = get_client()
+
+        # Resolve the demo voice from the on-disk cache first; only hit the
+        # voices endpoint on a cache miss
+        voice_name, voice_id = load_cached_voice()
+        if voice_id is None:
+            print("📋 Fetching available voices...")
+            voices_response = client.voices.search()
+            voices = voices_response.voices
+            print(f"✅ Found {len(voices)} voices")
+
+            # Show first few voices
+            for i, voice in enumerate(voices[:3]):
+                print(f"  {i+1}. {voice.name} (ID: {voice.voice_id})")
+
+            if voices:
+                voice_name, voice_id = voices[0].name, voices[0].voice_id
+                store_cached_voice(voice_name, voice_id)
+        else:
+            print(f"📋 Using cached voice: {voice_name} (ID: {voice_id})")
+
+        # Generate speech with the resolved voice
+        if voice_id:
             text = "Welcome to ElevenLabs Studio! This is a demonstration of our text-to-speech capabilities."
-            
-            print(f"\n🎤 Generating speech with voice: {voice.name}")
+
+            print(f"\n🎤 Generating speech with voice: {voice_name}")
             print(f"📝 Text: {text}")
             
             voice_settings = VoiceSettings(
@@ -62,20 +106,23 @@ def demo_text_to_speech():
             
             audio = client.text_to_speech.convert(
                 text=text,
-                voice_id=voice.voice_id,
+                voice_id=voice_id,
                 model_id="eleven_multilingual_v2",
                 voice_settings=voice_settings,
                 output_format="mp3_44100_128"
             )
             
-            # Save audio to file
-            audio_bytes = b''.join(audio)
+            # Stream audio chunks straight to disk; peak memory stays at one
+            # chunk instead of the whole clip
             output_file = "demo_output.mp3"
+            audio_size = 0
             with open(output_file, "wb") as f:
-                f.write(audio_bytes)
-            
+                for chunk in audio:
+                    f.write(chunk)
+                    audio_size += len(chunk)
+
             print(f"✅ Audio generated and saved to: {output_file}")
-            print(f"📊 Audio size: {len(audio_bytes)} bytes")
+            print(f"📊 Audio size: {audio_size} bytes")
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -91,7 +138,7 @@ def demo_voice_design():
         return
     
     try:
-        client = ElevenLabs(api_key=api_key)
+        client = get_client()
         
         voice_description = "A warm, friendly female voice with a slight British accent, perfect for audiobooks"
         
@@ -110,16 +157,30 @@ def demo_voice_design():
         
         print(f"✅ Generated {len(response.previews)} voice previews")
         
+        # Hand file writes to background threads so decoding the next
+        # preview overlaps with saving the previous one
+        # binascii.a2b_base64 skips base64.b64decode's wrapper and
+        # validation pre-scan; the API's strings are well-formed
+        import binascii
+        import threading
+
+        def _save_preview(audio_bytes, output_file):
+            with open(output_file, "wb") as f:
+                f.write(audio_bytes)
+
+        writers = []
         for i, preview in enumerate(response.previews):
             print(f"  Preview {i+1}: Voice ID {preview.generated_voice_id}")
-            
-            # Save preview audio
-            import base64
-            audio_bytes = base64.b64decode(preview.audio_base_64)
+
+            audio_bytes = binascii.a2b_base64(preview.audio_base_64)
             output_file = f"voice_preview_{i+1}.mp3"
-            with open(output_file, "wb") as f:
-                f.write(audio_bytes)
+            writer = threading.Thread(target=_save_preview, args=(audio_bytes, output_file))
+            writer.start()
+            writers.append(writer)
             print(f"    Saved to: {output_file}")
+
+        for writer in writers:
+            writer.join()
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -135,7 +196,7 @@ def demo_models_and_features():
         return
     
     try:
-        client = ElevenLabs(api_key=api_key)
+        client = get_client()
         
         # Get available models
         print("📋 Fetching available models...")
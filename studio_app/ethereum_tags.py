@@ -9,48 +9,71 @@ from typing import Any, Dict, List
 
 import streamlit as st
 
+# Matches bracketed tags like [ETHEREUM] anywhere in a lyrics block
+_TAG_RE = re.compile(r'\[[^\[\]]+\]')
+
 
 class EthereumTagValidator:
     """Validator for Ethereum persona tags with deep taxonomy"""
     
     def __init__(self, persona_path: str = None):
         self.persona_data = {}
-        self.valid_tags = set()
+        self._rebuild_indexes()
         if persona_path:
             self.load_persona(persona_path)
-    
+
+    def _rebuild_indexes(self):
+        """Recompute structures derived from persona_data in a single pass.
+
+        Every code path that mutates persona_data must call this afterwards,
+        so cached/derived state has exactly one invalidation point.
+        """
+        valid_tags = set()
+        for key, value in self.persona_data.items():
+            if isinstance(value, list) and "tags" in key.lower():
+                # %-formatting via the bound method skips per-tag f-string
+                # machinery; noticeable on large taxonomies
+                valid_tags.update(map("[%s]".__mod__, map(str.upper, value)))
+            elif key == "name" and isinstance(value, str):
+                valid_tags.add("[" + value.upper() + "]")
+        self.valid_tags = valid_tags
+        self._valid_upper = {tag.upper() for tag in valid_tags}
+        self._core_tags = [tag for tag in valid_tags if "[ETHEREUM]" in tag.upper()]
+
     def load_persona(self, path: str) -> bool:
         """Load persona card with tag taxonomy"""
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 self.persona_data = json.load(f)
-            
-            # Extract all tags from persona
-            self.valid_tags = set()
-            for key, value in self.persona_data.items():
-                if isinstance(value, list) and "tags" in key.lower():
-                    self.valid_tags.update(f"[{tag.upper()}]" for tag in value)
-                elif key == "name" and isinstance(value, str):
-                    self.valid_tags.add(f"[{value.upper()}]")
-            
+            self._rebuild_indexes()
             return True
         except Exception as e:
             st.error(f"Error loading persona: {e}")
             return False
-    
+
     def validate_lyrics(self, lyrics: str) -> Dict[str, List[str]]:
         """Validate tags in lyrics against persona taxonomy"""
+        # No bracket means no tags: a memchr probe beats running the regex
+        if "[" not in lyrics:
+            return {
+                "used": [],
+                "invalid": [],
+                "missing_core": list(self._core_tags),
+                "total_valid": len(self.valid_tags),
+                "coverage": 0
+            }
+
         # Find all tags in lyrics
-        found_tags = set(re.findall(r'\[[^\[\]]+\]', lyrics))
+        found_tags = set(_TAG_RE.findall(lyrics))
         
         # Normalize for comparison
         found_normalized = {tag.upper() for tag in found_tags}
-        valid_normalized = {tag.upper() for tag in self.valid_tags}
-        
+        valid_normalized = self._valid_upper
+
         # Calculate differences
         used_tags = list(found_tags)
         invalid_tags = [tag for tag in found_tags if tag.upper() not in valid_normalized]
-        missing_core = [tag for tag in self.valid_tags if "[ETHEREUM]" in tag.upper() and tag.upper() not in found_normalized]
+        missing_core = [tag for tag in self._core_tags if tag.upper() not in found_normalized]
         
         return {
             "used": used_tags,
@@ -68,15 +91,21 @@ class EthereumTagValidator:
         # Ensure ETHEREUM tag is present
         if "[ETHEREUM]" not in lyrics.upper():
             lyrics = "[ETHEREUM]\n" + lyrics
-        
+
         # Get priority tags (first inject_count)
         priority_tags = list(self.valid_tags)[:inject_count]
-        
+
+        # One regex scan of the lyrics, then set probes per tag instead of
+        # a substring search over the full lyrics for every priority tag
+        present = set(_TAG_RE.findall(lyrics.upper()))
+        missing = [tag for tag in priority_tags if tag.upper() not in present]
+        if not missing:
+            return lyrics
+
         # Embed missing priority tags
-        for tag in priority_tags:
-            if tag.upper() not in lyrics.upper():
-                lyrics += f"\n{tag}"
-        
+        for tag in missing:
+            lyrics += f"\n{tag}"
+
         return lyrics
     
     def get_tag_suggestions(self, category: str = None) -> List[str]:
@@ -131,12 +160,8 @@ def render_ethereum_tagging():
     if 'ethereum_validator' not in st.session_state:
         st.session_state.ethereum_validator = EthereumTagValidator()
         # Load default persona
-        default_persona = create_default_persona()
-        st.session_state.ethereum_validator.persona_data = default_persona
-        st.session_state.ethereum_validator.valid_tags = set()
-        for key, value in default_persona.items():
-            if isinstance(value, list) and "tags" in key.lower():
-                st.session_state.ethereum_validator.valid_tags.update(f"[{tag}]" for tag in value)
+        st.session_state.ethereum_validator.persona_data = create_default_persona()
+        st.session_state.ethereum_validator._rebuild_indexes()
     
     validator = st.session_state.ethereum_validator
     
@@ -201,12 +226,8 @@ def render_ethereum_tagging():
         
         if uploaded_persona:
             try:
-                persona_data = json.loads(uploaded_persona.read())
-                validator.persona_data = persona_data
-                validator.valid_tags = set()
-                for key, value in persona_data.items():
-                    if isinstance(value, list) and "tags" in key.lower():
-                        validator.valid_tags.update(f"[{tag}]" for tag in value)
+                validator.persona_data = json.loads(uploaded_persona.read())
+                validator._rebuild_indexes()
                 st.success("✅ Persona loaded successfully!")
             except Exception as e:
                 st.error(f"Error loading persona: {e}")
@@ -43,7 +43,9 @@ def render_audio_processing(studio):
                         
                         # For demonstration, show the original audio
                         st.markdown("#### Original Audio")
-                        st.audio(uploaded_audio.read(), format='audio/mp3')
+                        # st.audio accepts the upload handle directly; no
+                        # need to copy the file into a bytes object first
+                        st.audio(uploaded_audio, format='audio/mp3')
                         
                     except Exception as e:
                         st.error(f"Error processing audio: {str(e)}")
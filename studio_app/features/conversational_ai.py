@@ -1,9 +1,58 @@
 import json
 import os
 import sys
+from functools import lru_cache
+from operator import attrgetter
+
 import streamlit as st
 from utils import UIComponents
 
+
+@lru_cache(maxsize=1)
+def _get_agent_builder_cls():
+    """Resolve the AgentBuilder class once per process.
+
+    Keeps the sys.path fiddling and import machinery off the per-rerun path
+    and prevents repeated sys.path growth across sessions.
+    """
+    pages_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'pages')
+    if pages_dir not in sys.path:
+        sys.path.append(pages_dir)
+    from pages.agent_builder import AgentBuilder
+    return AgentBuilder
+
+# Optional faster JSON serializer for chat export
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional compact binary format for bulk chat export
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _dump_chat_json(history):
+    """Serialize chat history to pretty-printed JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(history, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(history, indent=2)
+
+
+def _append_chat_message(role: str, content: str):
+    """Append a chat turn with a monotonically increasing id"""
+    next_id = st.session_state.get('chat_message_seq', 0)
+    st.session_state.chat_message_seq = next_id + 1
+    st.session_state.chat_history.append({"id": next_id, "role": role, "content": content})
+
+
+@st.cache_data(show_spinner=False)
+def _serialize_chat(history_items: tuple) -> str:
+    """Serialize chat history for export; cached so an unchanged history is free"""
+    return _dump_chat_json([{"role": role, "content": content} for role, content in history_items])
+
 def render_conversational_ai(studio):
     """Render Conversational AI interface with full agent builder"""
     UIComponents.render_section_header("🤖 Conversational AI Agents", "Create, configure, and deploy intelligent voice agents with advanced AI capabilities")
@@ -19,15 +68,8 @@ def render_conversational_ai(studio):
     with tab1:
         # Load the comprehensive agent builder
         try:
-            # Add pages directory to path
-            pages_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'pages')
-            if pages_dir not in sys.path:
-                sys.path.append(pages_dir)
-            
-            from pages.agent_builder import AgentBuilder
-            
             # Initialize and run the agent builder
-            builder = AgentBuilder()
+            builder = _get_agent_builder_cls()()
             builder.run()
             
         except ImportError as e:
@@ -137,31 +179,40 @@ def render_chat_interface(studio):
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
     
-    # Chat display
+    # Chat display — render only the most recent turns so per-rerun cost
+    # stays bounded no matter how long the session gets
+    history = st.session_state.chat_history
+    visible = history if st.session_state.get('chat_show_all') else history[-_VISIBLE_CHAT_MESSAGES:]
     chat_container = st.container()
     with chat_container:
-        for message in st.session_state.chat_history:
+        if len(visible) < len(history):
+            if st.button(f"⬆️ Show older messages ({len(history) - len(visible)} hidden)"):
+                st.session_state.chat_show_all = True
+                st.rerun()
+        for message in visible:
             with st.chat_message(message["role"]):
-                st.write(message["content"])
-    
+                st.markdown(message["content"])
+
     # Chat input
     if prompt := st.chat_input("Type your message..."):
         # Add user message
-        st.session_state.chat_history.append({"role": "user", "content": prompt})
-        
+        _append_chat_message("user", prompt)
+
         # Simulate agent response
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 # This would integrate with the actual agent
                 response = f"I understand you said: '{prompt}'. This is a simulated response from your AI agent."
                 st.write(response)
-                st.session_state.chat_history.append({"role": "assistant", "content": response})
+                _append_chat_message("assistant", response)
     
     # Chat controls
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("🗑️ Clear Chat"):
             st.session_state.chat_history = []
+            st.session_state.chat_message_seq = 0
+            st.session_state.chat_show_all = False
             st.rerun()
     
     with col2:
@@ -170,14 +221,51 @@ def render_chat_interface(studio):
     
     with col3:
         if st.button("📤 Export Chat"):
-            chat_json = json.dumps(st.session_state.chat_history, indent=2)
+            st.session_state.show_export = True
+
+    # Serialization only runs once export has been requested; reruns that
+    # never touch export pay nothing, and the cached payload makes the
+    # download buttons free while the history is unchanged
+    if st.session_state.get('show_export'):
+        chat_json = _serialize_chat(
+            tuple((m["role"], m["content"]) for m in st.session_state.chat_history)
+        )
+        st.download_button(
+            "Download Chat",
+            chat_json,
+            "chat_history.json",
+            "application/json"
+        )
+        if msgpack is not None:
+            # Compact binary export for automation pipelines; JSON stays
+            # the human-readable default
             st.download_button(
-                "Download Chat",
-                chat_json,
-                "chat_history.json",
-                "application/json"
+                "Download Chat (msgpack)",
+                msgpack.packb(st.session_state.chat_history, use_bin_type=True),
+                "chat_history.msgpack",
+                "application/x-msgpack"
             )
 
+# How many recent chat turns to render without "Show older"
+_VISIBLE_CHAT_MESSAGES = 50
+
+# One bound attrgetter instead of repeated getattr calls per tool
+_tool_fields = attrgetter('name', 'description', 'type', 'tool_id')
+
+
+def _tool_meta(tool):
+    """Extract (name, description, type, tool_id) from a tool in one lookup pass"""
+    try:
+        return _tool_fields(tool)
+    except AttributeError:
+        return (
+            getattr(tool, 'name', 'Unknown Tool'),
+            getattr(tool, 'description', 'No description'),
+            getattr(tool, 'type', 'Unknown'),
+            getattr(tool, 'tool_id', 'unknown'),
+        )
+
+
 def render_tools_knowledge(studio):
     """Render tools and knowledge base management"""
     st.markdown("### 🛠️ Tools & Knowledge Base")
@@ -196,12 +284,13 @@ def render_tools_knowledge(studio):
                         tools = tools_response.tools
                         
                         if tools:
-                            for tool in tools[:10]:  # Show first 10 tools
-                                with st.expander(f"🔧 {getattr(tool, 'name', 'Unknown Tool')}"):
-                                    st.write(f"**Description:** {getattr(tool, 'description', 'No description')}")
-                                    st.write(f"**Type:** {getattr(tool, 'type', 'Unknown')}")
-                                    if st.button(f"Add {getattr(tool, 'name', 'Tool')}", key=f"add_tool_{getattr(tool, 'tool_id', 'unknown')}"):
-                                        st.success(f"Tool '{getattr(tool, 'name', 'Unknown')}' added to agent")
+                            tools_meta = [_tool_meta(tool) for tool in tools[:10]]  # Show first 10 tools
+                            for name, description, tool_type, tool_id in tools_meta:
+                                with st.expander(f"🔧 {name}"):
+                                    st.write(f"**Description:** {description}")
+                                    st.write(f"**Type:** {tool_type}")
+                                    if st.button(f"Add {name}", key=f"add_tool_{tool_id}"):
+                                        st.success(f"Tool '{name}' added to agent")
                         else:
                             st.info("No tools available in your workspace")
                     else:
@@ -237,8 +326,9 @@ def render_tools_knowledge(studio):
         
         if uploaded_files:
             st.success(f"Uploaded {len(uploaded_files)} files to knowledge base")
-            for file in uploaded_files:
-                st.write(f"📄 {file.name} ({file.size} bytes)")
+            # One markdown element for the whole list instead of one
+            # frontend element per file
+            st.markdown("\n".join(f"- 📄 {file.name} ({file.size} bytes)" for file in uploaded_files))
         
         # Knowledge base settings
         st.markdown("---")
@@ -1,5 +1,6 @@
+import io
 import streamlit as st
-from utils import UIComponents
+from utils import UIComponents, safe_voice_filename
 
 def render_speech_to_speech(studio):
     """Render Speech-to-Speech interface"""
@@ -22,6 +23,13 @@ def render_speech_to_speech(studio):
                 type=['mp3', 'wav', 'flac', 'm4a'],
                 help="Upload the audio you want to convert"
             )
+            if audio_file:
+                # Read the upload once per file; reruns from slider/widget
+                # changes reuse the cached bytes instead of re-reading
+                file_key = (audio_file.name, audio_file.size)
+                cached = st.session_state.get('s2s_upload_cache')
+                if cached is None or cached[0] != file_key:
+                    st.session_state.s2s_upload_cache = (file_key, audio_file.read())
         else:
             st.info("Audio recording feature would be implemented here using streamlit-audio-recorder or similar")
     
@@ -29,7 +37,7 @@ def render_speech_to_speech(studio):
         # Voice selection for conversion
         st.markdown("### 🎭 Target Voice")
         if st.session_state.voices:
-            voice_names = [f"{voice.name}" for voice in st.session_state.voices]
+            voice_names = [voice.name for voice in st.session_state.voices]
             selected_voice_idx = st.selectbox(
                 "Convert to voice",
                 range(len(voice_names)),
@@ -40,8 +48,11 @@ def render_speech_to_speech(studio):
         # Model selection for S2S
         st.markdown("### 🧠 Model")
         if st.session_state.models:
-            s2s_models = [model for model in st.session_state.models 
-                         if hasattr(model, 'can_do_voice_conversion') and model.can_do_voice_conversion]
+            # Precomputed at model load; fall back to filtering for sessions
+            # that populated models before the capability lists existed
+            s2s_models = st.session_state.get('s2s_models') or [
+                model for model in st.session_state.models if getattr(model, 'can_do_voice_conversion', False)
+            ]
             if s2s_models:
                 model_names = [model.name for model in s2s_models]
                 selected_model_idx = st.selectbox(
@@ -51,20 +62,24 @@ def render_speech_to_speech(studio):
                 )
                 selected_model = s2s_models[selected_model_idx]
     
-    # Advanced settings
+    # Advanced settings inside a form so widget changes batch into a
+    # single rerun at submit instead of one rerun per change
     with st.expander("⚙️ Advanced Settings"):
-        col_s2s1, col_s2s2 = st.columns(2)
-        
-        with col_s2s1:
-            output_format = st.selectbox(
-                "Output Format",
-                ["mp3_44100_128", "mp3_44100_192", "pcm_16000", "pcm_22050"]
-            )
-            remove_bg_noise = st.checkbox("Remove Background Noise", True)
-        
-        with col_s2s2:
-            enable_logging = st.checkbox("Enable Logging", False)
-            optimize_streaming = st.slider("Optimize Streaming", 0, 4, 0)
+        with st.form("s2s_advanced"):
+            col_s2s1, col_s2s2 = st.columns(2)
+
+            with col_s2s1:
+                output_format = st.selectbox(
+                    "Output Format",
+                    ["mp3_44100_128", "mp3_44100_192", "pcm_16000", "pcm_22050"]
+                )
+                remove_bg_noise = st.checkbox("Remove Background Noise", True)
+
+            with col_s2s2:
+                enable_logging = st.checkbox("Enable Logging", False)
+                optimize_streaming = st.slider("Optimize Streaming", 0, 4, 0)
+
+            st.form_submit_button("Apply")
     
     # Convert button
     if st.button("🔄 Convert Speech", type="primary", disabled=not audio_file):
@@ -74,8 +89,8 @@ def render_speech_to_speech(studio):
         
         with st.spinner("Converting speech..."):
             try:
-                # Read audio file
-                audio_bytes = audio_file.read()
+                # Cached at upload time; no re-read per conversion
+                audio_bytes = st.session_state.s2s_upload_cache[1]
                 
                 # Perform speech-to-speech conversion
                 converted_audio = studio.client.speech_to_speech.convert(
@@ -88,9 +103,12 @@ def render_speech_to_speech(studio):
                     optimize_streaming_latency=optimize_streaming if optimize_streaming > 0 else None
                 )
                 
-                # Convert to bytes for playback
-                converted_bytes = b''.join(converted_audio)
-                
+                # Write chunks into one buffer instead of materializing a
+                # chunk list plus a joined copy
+                converted_buffer = io.BytesIO()
+                for chunk in converted_audio:
+                    converted_buffer.write(chunk)
+
                 st.success("✅ Speech converted successfully!")
                 
                 # Show original and converted audio
@@ -102,13 +120,15 @@ def render_speech_to_speech(studio):
                 
                 with col_audio2:
                     st.markdown("#### 🎭 Converted Audio")
-                    st.audio(converted_bytes, format='audio/mp3')
-                
-                # Download button
+                    converted_buffer.seek(0)
+                    st.audio(converted_buffer, format='audio/mp3')
+
+                # Download button reuses the same buffer
+                converted_buffer.seek(0)
                 st.download_button(
                     label="📥 Download Converted Audio",
-                    data=converted_bytes,
-                    file_name=f"speech_to_speech_{selected_voice.name.replace(' ', '_')}.mp3",
+                    data=converted_buffer,
+                    file_name=f"speech_to_speech_{safe_voice_filename(selected_voice.voice_id, selected_voice.name)}.mp3",
                     mime="audio/mpeg"
                 )
             
@@ -1,7 +1,35 @@
 import base64
+import io
+from functools import lru_cache
+
 import streamlit as st
 from elevenlabs.types import VoiceSettings
-from utils import UIComponents
+from utils import UIComponents, safe_voice_filename
+
+
+@lru_cache(maxsize=64)
+def _voice_settings(stability: float, similarity_boost: float, style: float,
+                    use_speaker_boost: bool = True) -> VoiceSettings:
+    """Reuse VoiceSettings objects across generates with identical sliders"""
+    return VoiceSettings(
+        stability=stability,
+        similarity_boost=similarity_boost,
+        style=style,
+        use_speaker_boost=use_speaker_boost
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _voice_labels(voice_ids: tuple, names: tuple, descriptions: tuple) -> list:
+    """Build voice dropdown labels once per voice set instead of every rerun"""
+    return [f"{name} ({desc})" for name, desc in zip(names, descriptions)]
+
+
+@st.cache_data(show_spinner=False)
+def _model_labels(model_ids: tuple, names: tuple, descriptions: tuple) -> list:
+    """Build model dropdown labels once per model set instead of every rerun"""
+    return [f"{name} - {desc}" for name, desc in zip(names, descriptions)]
+
 
 def render_text_to_speech(studio):
     """Render Text-to-Speech interface"""
@@ -17,29 +45,48 @@ def render_text_to_speech(studio):
             placeholder="Type your text here... (e.g., 'The first move is what sets everything in motion.')"
         )
         
-        # Advanced settings
+        # Advanced settings inside a form so slider drags batch into a
+        # single rerun at submit instead of one rerun per step
         with st.expander("⚙️ Advanced Settings"):
-            col_adv1, col_adv2 = st.columns(2)
-            
-            with col_adv1:
-                stability = st.slider("Stability", 0.0, 1.0, 0.75, 0.01)
-                similarity_boost = st.slider("Similarity Boost", 0.0, 1.0, 0.75, 0.01)
-                style = st.slider("Style", 0.0, 1.0, 0.0, 0.01)
-                
-            with col_adv2:
-                enable_logging = st.checkbox("Enable Logging", False)
-                optimize_streaming = st.slider("Optimize Streaming Latency", 0, 4, 0)
-                output_format = st.selectbox(
-                    "Output Format",
-                    ["mp3_44100_128", "mp3_44100_192", "pcm_16000", "pcm_22050", "pcm_24000", "pcm_44100"]
-                )
+            with st.form("tts_advanced"):
+                col_adv1, col_adv2 = st.columns(2)
+
+                with col_adv1:
+                    stability = st.slider("Stability", 0.0, 1.0, 0.75, 0.01)
+                    similarity_boost = st.slider("Similarity Boost", 0.0, 1.0, 0.75, 0.01)
+                    style = st.slider("Style", 0.0, 1.0, 0.0, 0.01)
+
+                with col_adv2:
+                    enable_logging = st.checkbox("Enable Logging", False)
+                    optimize_streaming = st.slider("Optimize Streaming Latency", 0, 4, 0)
+                    output_format = st.selectbox(
+                        "Output Format",
+                        ["mp3_44100_128", "mp3_44100_192", "pcm_16000", "pcm_22050", "pcm_24000", "pcm_44100"]
+                    )
+
+                st.form_submit_button("Apply")
     
     with col2:
         # Voice selection
         st.markdown("### 🎭 Voice Selection")
         if st.session_state.voices:
-            voice_names = [f"{voice.name} ({voice.labels.get('description', 'No description') if voice.labels else 'No description'})" 
-                          for voice in st.session_state.voices]
+            voices = st.session_state.voices
+            # Rebuild labels only when the voice set actually changed; the
+            # voice_id tuple is the identity check (id() of the list isn't
+            # safe — addresses get reused after GC), and it doubles as the
+            # first _voice_labels argument
+            voice_ids = tuple(voice.voice_id for voice in voices)
+            label_cache = st.session_state.get('tts_voice_label_cache')
+            if label_cache is None or label_cache[0] != voice_ids:
+                voice_names = _voice_labels(
+                    voice_ids,
+                    tuple(voice.name for voice in voices),
+                    tuple(voice.labels.get('description', 'No description') if voice.labels else 'No description'
+                          for voice in voices)
+                )
+                st.session_state.tts_voice_label_cache = (voice_ids, voice_names)
+            else:
+                voice_names = label_cache[1]
             selected_voice_idx = st.selectbox(
                 "Select Voice",
                 range(len(voice_names)),
@@ -58,9 +105,17 @@ def render_text_to_speech(studio):
         # Model selection
         st.markdown("### 🧠 Model Selection")
         if st.session_state.models:
-            tts_models = [model for model in st.session_state.models if hasattr(model, 'can_do_text_to_speech') and model.can_do_text_to_speech]
+            # Precomputed at model load; fall back to filtering for sessions
+            # that populated models before the capability lists existed
+            tts_models = st.session_state.get('tts_models') or [
+                model for model in st.session_state.models if getattr(model, 'can_do_text_to_speech', False)
+            ]
             if tts_models:
-                model_names = [f"{model.name} - {model.description}" for model in tts_models]
+                model_names = _model_labels(
+                    tuple(model.model_id for model in tts_models),
+                    tuple(model.name for model in tts_models),
+                    tuple(model.description for model in tts_models)
+                )
                 selected_model_idx = st.selectbox(
                     "Select Model",
                     range(len(model_names)),
@@ -82,13 +137,8 @@ def render_text_to_speech(studio):
         
         with st.spinner("Generating speech..."):
             try:
-                voice_settings = VoiceSettings(
-                    stability=stability,
-                    similarity_boost=similarity_boost,
-                    style=style,
-                    use_speaker_boost=True
-                )
-                
+                voice_settings = _voice_settings(stability, similarity_boost, style)
+
                 audio = studio.client.text_to_speech.convert(
                     text=text,
                     voice_id=selected_voice.voice_id,
@@ -99,11 +149,6 @@ def render_text_to_speech(studio):
                     optimize_streaming_latency=optimize_streaming if optimize_streaming > 0 else None
                 )
                 
-                # Convert audio bytes to base64 for playback
-                audio_bytes = b''.join(audio)
-                
-                st.success("✅ Speech generated successfully!")
-                
                 # Audio player with Supabase styling
                 st.markdown("""
                 <div class="audio-player glass-card">
@@ -113,14 +158,28 @@ def render_text_to_speech(studio):
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
-                
-                st.audio(audio_bytes, format='audio/mp3')
-                
-                # Download button
+
+                # Stream chunks into the player as they arrive so playback
+                # can start before generation finishes
+                audio_placeholder = st.empty()
+                audio_buffer = io.BytesIO()
+                bytes_since_refresh = 0
+                for chunk in audio:
+                    audio_buffer.write(chunk)
+                    bytes_since_refresh += len(chunk)
+                    if bytes_since_refresh >= 256 * 1024:
+                        audio_placeholder.audio(audio_buffer.getvalue(), format='audio/mp3')
+                        bytes_since_refresh = 0
+
+                audio_placeholder.audio(audio_buffer.getvalue(), format='audio/mp3')
+                st.success("✅ Speech generated successfully!")
+
+                # Download button reuses the same buffer
+                audio_buffer.seek(0)
                 st.download_button(
                     label="📥 Download Audio",
-                    data=audio_bytes,
-                    file_name=f"elevenlabs_tts_{selected_voice.name.replace(' ', '_')}.mp3",
+                    data=audio_buffer,
+                    file_name=f"elevenlabs_tts_{safe_voice_filename(selected_voice.voice_id, selected_voice.name)}.mp3",
                     mime="audio/mpeg"
                 )
                 
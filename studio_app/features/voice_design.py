@@ -1,8 +1,30 @@
-import base64
 import os
 import streamlit as st
 from utils import UIComponents
 
+
+def _save_sample(uploaded_file, temp_dir: str) -> str:
+    """Copy one uploaded sample into temp_dir with a bounded buffer"""
+    # Deferred: only the instant-clone path ever touches shutil
+    import shutil
+
+    file_path = os.path.join(temp_dir, uploaded_file.name)
+    uploaded_file.seek(0)
+    with open(file_path, "wb") as f:
+        # Lay the file down as contiguous extents up front; the final size
+        # is already known from the upload
+        if hasattr(os, 'posix_fallocate') and uploaded_file.size:
+            os.posix_fallocate(f.fileno(), 0, uploaded_file.size)
+        shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+        f.flush()
+        os.fsync(f.fileno())
+        # These pages are read back once for the upload and then deleted;
+        # tell the kernel not to keep them cached (no-op off Linux)
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return file_path
+
+
 def render_voice_design(studio):
     """Render Voice Design & Cloning interface"""
     UIComponents.render_section_header("🎭 Voice Design & Cloning", "Create unique AI voices or clone existing ones")
@@ -50,6 +72,10 @@ def render_voice_design(studio):
             
             with st.spinner("Generating voice previews..."):
                 try:
+                    # Single awaitable call, so the sync client is the right
+                    # tool: running the shared async client under a throwaway
+                    # asyncio.run loop binds its keep-alive connections to a
+                    # loop that is closed on return, breaking the next call
                     response = studio.client.text_to_voice.create_previews(
                         voice_description=voice_description,
                         output_format=output_format,
@@ -62,15 +88,29 @@ def render_voice_design(studio):
                     )
                     
                     st.success(f"✅ Generated {len(response.previews)} voice previews!")
-                    
+
+                    # Fresh batch: any remembered preview index belongs to
+                    # the previous batch, so start with all previews open
+                    st.session_state.active_preview = None
+
                     # Display previews
                     for i, preview in enumerate(response.previews):
+                        # Once a preview is active, collapse the others so a
+                        # button click reruns O(1) preview bodies, not all N
+                        if st.session_state.get("active_preview") not in (None, i):
+                            st.markdown(f"#### Preview {i+1} (collapsed)")
+                            continue
+
                         with st.container():
                             st.markdown(f"#### Preview {i+1}")
-                            
-                            # Decode base64 audio
-                            audio_bytes = base64.b64decode(preview.audio_base_64)
-                            st.audio(audio_bytes, format='audio/mp3')
+
+                            # Hand the base64 straight to the browser as a
+                            # data URI; the native decoder replaces a full
+                            # Python-side decode pass per rerun
+                            st.markdown(
+                                f'<audio controls src="data:audio/mp3;base64,{preview.audio_base_64}"></audio>',
+                                unsafe_allow_html=True
+                            )
                             
                             col_preview1, col_preview2 = st.columns([3, 1])
                             with col_preview1:
@@ -78,6 +118,7 @@ def render_voice_design(studio):
                             
                             with col_preview2:
                                 if st.button(f"Create Voice from Preview {i+1}", key=f"create_{i}"):
+                                    st.session_state.active_preview = i
                                     # Create voice from preview
                                     voice_name = st.text_input(f"Voice Name for Preview {i+1}", f"AI Voice {i+1}")
                                     if voice_name:
@@ -116,27 +157,39 @@ def render_voice_design(studio):
             
             if st.button("📸 Create Instant Clone", type="primary"):
                 with st.spinner("Creating instant voice clone..."):
+                    # Deferred imports: only this click path needs them, and
+                    # Streamlit imports every page module on first paint
+                    import tempfile
+                    from concurrent.futures import ThreadPoolExecutor
+
                     try:
-                        # Save uploaded files temporarily
-                        file_paths = []
-                        for uploaded_file in uploaded_files:
-                            file_path = f"temp_{uploaded_file.name}"
-                            with open(file_path, "wb") as f:
-                                f.write(uploaded_file.getbuffer())
-                            file_paths.append(file_path)
-                        
-                        # Create voice clone
-                        voice = studio.client.voices.ivc.create(
-                            name=voice_name,
-                            description=voice_description,
-                            files=file_paths
-                        )
-                        
+                        # Stage uploads in a private temp dir: cleanup is
+                        # guaranteed on any exit path and concurrent sessions
+                        # can't collide on identical filenames
+                        with tempfile.TemporaryDirectory() as temp_dir:
+                            # Bounded copy buffer instead of slurping each
+                            # file into RAM
+                            # Independent files: write them concurrently so
+                            # elapsed time is the slowest file, not the sum
+                            with ThreadPoolExecutor(max_workers=max(1, min(4, len(uploaded_files)))) as executor:
+                                file_paths = list(executor.map(
+                                    lambda uf: _save_sample(uf, temp_dir), uploaded_files
+                                ))
+
+                            # Create voice clone from open handles so the
+                            # HTTP client can stream the upload
+                            file_handles = [open(p, "rb") for p in file_paths]
+                            try:
+                                voice = studio.client.voices.ivc.create(
+                                    name=voice_name,
+                                    description=voice_description,
+                                    files=file_handles
+                                )
+                            finally:
+                                for fh in file_handles:
+                                    fh.close()
+
                         st.success(f"✅ Instant voice clone '{voice_name}' created! Voice ID: {voice.voice_id}")
-                        
-                        # Clean up temporary files
-                        for file_path in file_paths:
-                            os.remove(file_path)
                     
                     except Exception as e:
                         st.error(f"Error creating voice clone: {str(e)}")
@@ -3,61 +3,411 @@ ElevenLabs Studio - Conversational AI Agent Builder
 Advanced agent creation and management with full configuration options
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import random
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from html import escape
 from typing import Any, Dict
 
 import streamlit as st
 
+# Small shared pool for background prefetches kicked off during init
+_thread_pool = ThreadPoolExecutor(max_workers=2)
+
+# Key digests back to the keys themselves, so background fetches never
+# touch st.session_state (worker threads have no script run context)
+_api_keys: Dict[str, str] = {}
+
+# Model choices per ASR provider; table lookup instead of branch chains
+ASR_MODEL_OPTIONS = {
+    'openai': ['whisper-1'],
+    'elevenlabs': ['nova-2', 'nova-1'],
+}
+
 # Import ElevenLabs components
 try:
-    from elevenlabs.client import ElevenLabs
+    from elevenlabs.client import AsyncElevenLabs, ElevenLabs
+except ImportError as e:
+    st.error(f"ElevenLabs import error: {e}")
+    st.stop()
+
+
+@lru_cache(maxsize=1)
+def _config_types():
+    """Deferred import of the conversational config models.
+
+    Only the deploy path needs these; keeping them out of module import
+    trims Streamlit first-render time for sessions that never deploy.
+    """
     from elevenlabs.types import (
         AgentConfig,
-        AgentPlatformSettingsRequestModel,
         AsrConversationalConfig,
         ConversationalConfig,
         ConversationConfig,
-        LanguagePresetOutput,
-        ToolRequestModel,
         TtsConversationalConfigOutput,
         TurnConfig,
     )
-except ImportError as e:
-    st.error(f"ElevenLabs import error: {e}")
-    st.stop()
+    return (AgentConfig, AsrConversationalConfig, ConversationalConfig,
+            ConversationConfig, TtsConversationalConfigOutput, TurnConfig)
+
+# Optional C-level JSON serializer for config previews and exports
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional schema validators for the tool-builder JSON text areas, in
+# preference order: jsonschema-rs (Rust, no per-keyword interpreter
+# overhead), then fastjsonschema (schema-compiled Python)
+try:
+    import jsonschema_rs
+except ImportError:
+    jsonschema_rs = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+def _dumps_pretty(obj, sort_keys: bool = False) -> bytes:
+    """Serialize a config with indentation, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2, sort_keys=sort_keys).encode()
+
+
+@lru_cache(maxsize=16)
+def _load_kb_text(path: str) -> str:
+    """Read one staged knowledge-base file on demand.
+
+    Uploads are staged to temp files and only their paths kept in
+    session state; this is the read path for the content when the
+    knowledge base is actually queried. The LRU bound keeps resident
+    memory at the 16 most recently used files rather than every upload.
+    """
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _loads(text: str):
+    """Parse JSON with orjson when available, keeping it symmetric with
+    _dumps_pretty; orjson.JSONDecodeError subclasses ValueError so
+    existing handlers keep working."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Meta-schemas for the tool-builder JSON blobs: parameter schemas are a
+# mapping of name to {'type', 'description'}; headers map name to value
+_TOOL_SCHEMAS = {
+    'parameters': {
+        "type": "object",
+        "additionalProperties": {
+            "type": "object",
+            "properties": {
+                "type": {"type": "string"},
+                "description": {"type": "string"},
+            },
+        },
+    },
+    'headers': {
+        "type": "object",
+        "additionalProperties": {"type": "string"},
+    },
+}
+
+
+def _validate_tool_json(text: str, schema_key: str):
+    """Validate one tool-builder JSON blob; returns an error string or None.
+
+    Validators are built once per schema and kept in session state, so
+    submissions reuse them instead of re-walking the meta-schema each
+    time. Without either optional validator installed, this degrades to
+    a plain parse check.
+    """
+    try:
+        value = _loads(text)
+    except ValueError as e:
+        return f"not valid JSON: {e}"
+
+    schema = _TOOL_SCHEMAS[schema_key]
+
+    if jsonschema_rs is not None:
+        cache = st.session_state.setdefault('_rs_validators', {})
+        validator = cache.get(schema_key)
+        if validator is None:
+            validator = cache[schema_key] = jsonschema_rs.JSONSchema(schema)
+        # is_valid is the fast go/no-go; validate (which builds the
+        # error object) only runs once a blob has already failed
+        if not validator.is_valid(value):
+            try:
+                validator.validate(value)
+            except jsonschema_rs.ValidationError as e:
+                return str(e)
+        return None
+
+    if fastjsonschema is not None:
+        cache = st.session_state.setdefault('_fjs_validators', {})
+        validator = cache.get(schema_key)
+        if validator is None:
+            validator = cache[schema_key] = fastjsonschema.compile(schema)
+        try:
+            validator(value)
+        except fastjsonschema.JsonSchemaValueException as e:
+            return e.message
+    return None
+
+@st.cache_resource(show_spinner=False)
+def _get_client(api_key: str) -> ElevenLabs:
+    """One ElevenLabs client per API key, shared across reruns.
+
+    AgentBuilder is re-instantiated on every rerun; caching the client
+    keeps its HTTP connection pool (and kept-alive TLS connections) warm
+    instead of forcing a fresh handshake before each API call.
+    """
+    return ElevenLabs(api_key=api_key)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_voices(api_key_hash: str) -> list:
+    """Fetch the voice list once per API key, cached for five minutes.
+
+    Keyed on a digest of the API key so rotating keys invalidates the
+    cache; returns ready-made (label, voice_id) pairs so the selector
+    labels are formatted once per fetch instead of once per rerun, and
+    the result pickles cleanly instead of caching SDK response objects.
+    """
+    client = _get_client(_api_keys.get(api_key_hash))
+    voices_response = client.voices.search()
+    voices = voices_response.voices if hasattr(voices_response, 'voices') else []
+    # Limit to first 20
+    return [(f"{voice.name} ({voice.voice_id})", voice.voice_id) for voice in voices[:20]]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_tools(api_key_hash: str, _client) -> list:
+    """Workspace tools list, cached for five minutes per API key.
+
+    The leading underscore keeps the client itself out of the cache key;
+    the key digest stands in for it.
+    """
+    tools_response = _client.conversational_ai.tools.list()
+    return tools_response.tools if hasattr(tools_response, 'tools') else []
+
+
+@st.cache_data(show_spinner=False)
+def _config_preview_json(cfg_compact: str) -> str:
+    """Pretty-print the config preview, cached on its compact serialization.
+
+    The compact dump doubles as the cache key, so reruns with an
+    unchanged config skip the indent/sort serialization pass entirely.
+    """
+    return _dumps_pretty(_loads(cfg_compact), sort_keys=True).decode()
+
+
+@st.cache_data(show_spinner=False)
+def _read_css(path: str) -> str:
+    """Read a stylesheet once per session instead of on every rerun"""
+    with open(path) as f:
+        return f.read()
+
 
 def load_css():
     """Load custom CSS for the agent builder"""
-    # Load main style.css
-    try:
-        with open('style.css') as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except FileNotFoundError:
-        # Fallback if running from pages directory
+    # Load main style.css ('../style.css' when running from pages/)
+    for css_path in ('style.css', '../style.css'):
         try:
-            with open('../style.css') as f:
-                st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-        except:
-            pass
-            
+            css = _read_css(css_path)
+        except OSError:
+            continue
+        # Gate on a hash of the payload rather than a boolean so the
+        # stylesheet ships once per session, but a dev reload that
+        # changes the CSS mismatches the hash and re-injects
+        css_hash = hash(css)
+        if st.session_state.get('_css_hash') == css_hash:
+            return
+        st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
+        st.session_state['_css_hash'] = css_hash
+        return
+
     # Agent Builder Specific Styles are now in style.css
 
+
+@lru_cache(maxsize=8)
+def _build_conversational_config(cfg_compact: str):
+    """Build a ConversationalConfig from a compact JSON snapshot.
+
+    Model instantiation runs the full pydantic validator chain, so the
+    built instance is memoized on the serialized input sections and
+    reused across deploys of the same configuration.
+    """
+    (AgentConfig, AsrConversationalConfig, ConversationalConfig,
+     ConversationConfig, TtsConversationalConfigOutput, TurnConfig) = _config_types()
+
+    sections = _loads(cfg_compact)
+    conv_config = sections.get('conversation', {})
+    voice_config = sections.get('voice', {})
+    asr_config = sections.get('asr', {})
+    turn_config = sections.get('turn_detection', {})
+
+    # TTS Config
+    tts_config = TtsConversationalConfigOutput(
+        voice_id=voice_config.get('voice_id', 'JBFqnCBsd6RMkjVDRZzb'),
+        model_id=voice_config.get('model_id', 'eleven_turbo_v2_5'),
+    )
+
+    # Conversation Config
+    conversation_config = ConversationConfig(
+        max_duration_seconds=conv_config.get('max_duration_seconds', 600),
+        client_events=["audio", "interruption"],
+    )
+
+    # ASR Config
+    asr_settings = AsrConversationalConfig(
+        quality="high",
+        provider=asr_config.get('provider', 'elevenlabs'),
+        user_input_audio_format="pcm_16000"
+    )
+
+    # Turn Config
+    turn_settings = TurnConfig(
+        turn_timeout=float(conv_config.get('time_out_seconds', 30)),
+        mode=turn_config.get('type', 'server_vad')
+    )
+
+    # Construct main config
+    return ConversationalConfig(
+        agent=AgentConfig(
+            prompt={
+                "prompt": conv_config.get('system_prompt', 'You are a helpful assistant.')
+            },
+            first_message=conv_config.get('first_message', 'Hello!'),
+            language=conv_config.get('language', 'en')
+        ),
+        tts=tts_config,
+        conversation=conversation_config,
+        asr=asr_settings,
+        turn=turn_settings
+    )
+
+
+def _render_server_vad(turn_config: Dict[str, Any], col_left, col_right):
+    """Widgets specific to server-side voice activity detection"""
+    with col_left:
+        turn_config['threshold'] = st.slider(
+            "VAD Threshold",
+            min_value=0.0,
+            max_value=1.0,
+            value=turn_config.get('threshold', 0.5),
+            step=0.05,
+            help="Voice activity detection sensitivity"
+        )
+
+    with col_right:
+        turn_config['prefix_padding_ms'] = st.number_input(
+            "Prefix Padding (ms)",
+            min_value=0,
+            max_value=1000,
+            value=turn_config.get('prefix_padding_ms', 300),
+            help="Audio padding before speech detection"
+        )
+
+        turn_config['silence_duration_ms'] = st.number_input(
+            "Silence Duration (ms)",
+            min_value=500,
+            max_value=5000,
+            value=turn_config.get('silence_duration_ms', 1000),
+            help="Silence duration to trigger turn end"
+        )
+
+
+# Turn-detection widget renderers by type; 'none' has no extra settings
+_TURN_RENDERERS = {
+    'server_vad': _render_server_vad,
+    'none': None,
+}
+
+# Conversation bubble templates, hoisted so the history loop formats a
+# prebuilt template instead of executing an f-string per message
+_USER_BUBBLE = '<div class="conversation-bubble user-bubble"><strong>You:</strong> {}</div>'
+_AGENT_BUBBLE = '<div class="conversation-bubble agent-bubble"><strong>Agent:</strong> {}</div>'
+
+# Canned simulation replies; immutable so no per-call list rebuild
+_SIM_RESPONSES = (
+    "I understand your message. How can I help you further?",
+    "That's interesting! Can you tell me more about that?",
+    "Based on my configuration, I would suggest...",
+    "Let me think about that for a moment...",
+    "I'm here to help! What would you like to know?",
+)
+
+
+def _build_agent_card_html(agent_data: Dict[str, Any]) -> str:
+    """Build the list card for one agent.
+
+    Agent data only changes on save/delete, so this runs at mutation time
+    and the result is kept in agents_summary instead of being rebuilt
+    for every agent on every rerun.
+    """
+    # Generator join (no intermediate list) and escaped tag text so
+    # user-entered '<'/'>' can't break out of the badge markup
+    tags_html = ''.join(f'<span class="status-badge status-active">{escape(tag)}</span>'
+                        for tag in agent_data.get('tags', ()))
+    return f"""
+    <div class="agent-card">
+        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+            <h3 style="color: var(--text-main); margin: 0;">{agent_data['name']}</h3>
+            <div>
+                <span class="status-badge status-active">Active</span>
+            </div>
+        </div>
+        <p style="color: var(--text-muted); margin-bottom: 1rem;">
+            {agent_data.get('description', 'No description')}
+        </p>
+        <div style="display: flex; gap: 0.5rem; margin-bottom: 1rem;">
+            {tags_html}
+        </div>
+        <div style="display: flex; gap: 1rem; align-items: center;">
+            <small style="color: var(--text-muted);">
+                Created: {agent_data.get('created_at', 'Unknown')}
+            </small>
+        </div>
+    </div>
+    """
+
+
 class AgentBuilder:
     """Comprehensive agent builder with full configuration management"""
     
     def __init__(self):
         self.client = None
+        self._voices_future = None
         self.init_client()
         self.init_session_state()
-    
+
     def init_client(self):
         """Initialize ElevenLabs client"""
         try:
             api_key = st.session_state.get('elevenlabs_api_key')
             if api_key:
-                self.client = ElevenLabs(api_key=api_key)
+                self.client = _get_client(api_key)
+                # Start the voice fetch now so the network round-trip
+                # overlaps with the rest of the page render; the Voice
+                # section consumes the future if it has resolved
+                key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+                _api_keys.setdefault(key_hash, api_key)
+                self._voices_future = _thread_pool.submit(_fetch_voices, key_hash)
         except Exception as e:
             st.error(f"Failed to initialize client: {e}")
     
@@ -65,6 +415,11 @@ class AgentBuilder:
         """Initialize session state for agent builder"""
         if 'agents' not in st.session_state:
             st.session_state.agents = {}
+        if 'agents_summary' not in st.session_state:
+            # Read-optimized (agent_id, card_html) pairs for the list
+            # render loop; the full configs in `agents` stay the source
+            # of truth and are only touched on Edit/Deploy/Delete
+            st.session_state.agents_summary = []
         if 'current_agent_config' not in st.session_state:
             st.session_state.current_agent_config = self.get_default_config()
         if 'available_tools' not in st.session_state:
@@ -119,7 +474,12 @@ class AgentBuilder:
     
     def render_header(self):
         """Render the agent builder header"""
-        st.markdown("""
+        # Snapshot the counts once instead of reaching through the
+        # session_state proxy per placeholder inside the template call
+        agents_count = len(st.session_state.agents)
+        tools_count = len(st.session_state.available_tools) + len(st.session_state.custom_tools)
+        conversations_count = len(st.session_state.test_conversation)
+        st.markdown(f"""
         <div class="agent-builder-container">
             <h1 style="color: var(--text-main); margin-bottom: 0.5rem;">
                 🤖 <span class="gradient-text">Conversational AI Agent Builder</span>
@@ -155,94 +515,97 @@ class AgentBuilder:
                 </div>
             </div>
         </div>
-        """.format(
-            agents_count=len(st.session_state.agents),
-            tools_count=len(st.session_state.available_tools) + len(st.session_state.custom_tools),
-            conversations_count=len(st.session_state.test_conversation)
-        ), unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
     
     def render_agent_list(self):
         """Render list of existing agents"""
         st.markdown('<div class="section-header">🎯 Your Agents</div>', unsafe_allow_html=True)
         
-        if not st.session_state.agents:
+        agents = st.session_state.agents
+        if not agents:
             st.info("No agents created yet. Use the builder below to create your first agent!")
             return
-        
-        for agent_id, agent_data in st.session_state.agents.items():
+
+        # Backfill for agents saved before the summary existed
+        summary = st.session_state.get('agents_summary')
+        if not summary or len(summary) != len(agents):
+            summary = [(agent_id, _build_agent_card_html(agent_data))
+                       for agent_id, agent_data in agents.items()]
+            st.session_state.agents_summary = summary
+
+        for agent_id, card_html in summary:
             with st.container():
-                tags_html = ''.join([f'<span class="status-badge status-active">{tag}</span>' 
-                                     for tag in agent_data.get('tags', [])])
-                st.markdown(f"""
-                <div class="agent-card">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
-                        <h3 style="color: var(--text-main); margin: 0;">{agent_data['name']}</h3>
-                        <div>
-                            <span class="status-badge status-active">Active</span>
-                        </div>
-                    </div>
-                    <p style="color: var(--text-muted); margin-bottom: 1rem;">
-                        {agent_data.get('description', 'No description')}
-                    </p>
-                    <div style="display: flex; gap: 0.5rem; margin-bottom: 1rem;">
-                        {tags_html}
-                    </div>
-                    <div style="display: flex; gap: 1rem; align-items: center;">
-                        <small style="color: var(--text-muted);">
-                            Created: {agent_data.get('created_at', 'Unknown')}
-                        </small>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(card_html, unsafe_allow_html=True)
                 
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    if st.button(f"Edit {agent_data['name']}", key=f"edit_{agent_id}"):
-                        st.session_state.current_agent_config = agent_data
-                        st.rerun()
-                with col2:
-                    if st.button(f"Test {agent_data['name']}", key=f"test_{agent_id}"):
-                        st.session_state.testing_agent = agent_id
-                        st.rerun()
-                with col3:
-                    if st.button(f"Deploy {agent_data['name']}", key=f"deploy_{agent_id}"):
-                        self.deploy_agent(agent_id, agent_data)
-                with col4:
-                    if st.button(f"Delete {agent_data['name']}", key=f"delete_{agent_id}"):
-                        del st.session_state.agents[agent_id]
-                        st.rerun()
+                # One selectbox + one button per agent instead of four
+                # buttons in four columns keeps the per-rerun widget count
+                # (and the diff Streamlit ships to the browser) small
+                col_action, col_apply = st.columns([3, 1])
+                with col_action:
+                    action = st.selectbox(
+                        "Action",
+                        ["—", "Edit", "Test", "Deploy", "Delete"],
+                        key=f"act_{agent_id}",
+                        label_visibility="collapsed"
+                    )
+                with col_apply:
+                    if st.button("Apply", key=f"apply_{agent_id}"):
+                        # Only a click pulls the full config out of the
+                        # cold store; the render loop never touches it
+                        self.run_agent_action(action, agent_id, agents[agent_id])
+
+        if st.button("🚀 Deploy All Agents"):
+            self.deploy_all_agents()
+
+    def run_agent_action(self, action: str, agent_id: str, agent_data: Dict[str, Any]):
+        """Dispatch an agent-list action by table lookup"""
+        def edit():
+            st.session_state.current_agent_config = agent_data
+            st.rerun()
+
+        def test():
+            st.session_state.testing_agent = agent_id
+            st.rerun()
+
+        def deploy():
+            self.deploy_agent(agent_id, agent_data)
+
+        def delete():
+            del st.session_state.agents[agent_id]
+            st.session_state.agents_summary = [
+                entry for entry in st.session_state.get('agents_summary', [])
+                if entry[0] != agent_id
+            ]
+            st.rerun()
+
+        dispatch = {'Edit': edit, 'Test': test, 'Deploy': deploy, 'Delete': delete}
+        handler = dispatch.get(action)
+        if handler:
+            handler()
     
     def render_agent_configurator(self):
         """Render the main agent configuration interface"""
         st.markdown('<div class="section-header">⚙️ Agent Configuration</div>', unsafe_allow_html=True)
-        
-        # Configuration tabs
-        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-            "🎭 Basic Settings", 
-            "🗣️ Voice & Speech", 
-            "🧠 Conversation", 
-            "🛠️ Tools & Actions", 
-            "📚 Knowledge Base", 
-            "🔧 Advanced"
-        ])
-        
-        with tab1:
-            self.render_basic_settings()
-        
-        with tab2:
-            self.render_voice_settings()
-        
-        with tab3:
-            self.render_conversation_settings()
-        
-        with tab4:
-            self.render_tools_settings()
-        
-        with tab5:
-            self.render_knowledge_base_settings()
-        
-        with tab6:
-            self.render_advanced_settings()
+
+        # st.tabs runs every tab body on every rerun; a radio-backed
+        # section switcher renders only the active section's widgets
+        sections = {
+            "🎭 Basic Settings": self.render_basic_settings,
+            "🗣️ Voice & Speech": self.render_voice_settings,
+            "🧠 Conversation": self.render_conversation_settings,
+            "🛠️ Tools & Actions": self.render_tools_settings,
+            "📚 Knowledge Base": self.render_knowledge_base_settings,
+            "🔧 Advanced": self.render_advanced_settings,
+        }
+
+        active = st.radio(
+            "Configuration Section",
+            list(sections.keys()),
+            horizontal=True,
+            label_visibility="collapsed",
+            key="active_tab"
+        )
+        sections[active]()
     
     def render_basic_settings(self):
         """Render basic agent settings"""
@@ -268,25 +631,24 @@ class AgentBuilder:
             # Tags management
             st.subheader("Tags")
             current_tags = config.get('tags', [])
-            
+
+            # Tags seen this session, so removed tags stay offered
+            known_tags = st.session_state.setdefault('known_tags', set())
+            known_tags.update(current_tags)
+
             new_tag = st.text_input("Add Tag", placeholder="e.g., customer-service")
             if st.button("Add Tag") and new_tag and new_tag not in current_tags:
-                current_tags.append(new_tag)
-                config['tags'] = current_tags
+                known_tags.add(new_tag)
+                config['tags'] = current_tags + [new_tag]
                 st.rerun()
-            
-            # Display current tags
-            if current_tags:
-                st.write("Current tags:")
-                for i, tag in enumerate(current_tags):
-                    col_tag, col_remove = st.columns([3, 1])
-                    with col_tag:
-                        st.write(f"• {tag}")
-                    with col_remove:
-                        if st.button("❌", key=f"remove_tag_{i}"):
-                            current_tags.remove(tag)
-                            config['tags'] = current_tags
-                            st.rerun()
+
+            # One multiselect instead of a row of widgets per tag keeps
+            # the widget count constant as tags accumulate
+            config['tags'] = st.multiselect(
+                "Current tags",
+                options=sorted(known_tags),
+                default=current_tags
+            )
         
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -304,24 +666,33 @@ class AgentBuilder:
             
             # Voice selection
             if self.client:
+                voice_options = None
                 try:
-                    voices_response = self.client.voices.search()
-                    voices = voices_response.voices if hasattr(voices_response, 'voices') else []
-                    voice_options = {f"{voice.name} ({voice.voice_id})": voice.voice_id 
-                                   for voice in voices[:20]}  # Limit to first 20
-                    
+                    if self._voices_future is not None:
+                        # Prefetched in the background from init_client;
+                        # consume the result only once it has resolved so
+                        # the rerun never blocks on the network
+                        if self._voices_future.done():
+                            voice_options = dict(self._voices_future.result())
+                    else:
+                        api_key = st.session_state.get('elevenlabs_api_key', '')
+                        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+                        _api_keys.setdefault(key_hash, api_key)
+                        voice_options = dict(_fetch_voices(key_hash))
+                except Exception as e:
+                    st.warning(f"Could not load voices: {e}")
+
+                if voice_options:
                     selected_voice = st.selectbox(
                         "Select Voice",
                         options=list(voice_options.keys()),
-                        index=0 if voice_options else 0,
+                        index=0,
                         help="Choose the voice for your agent"
                     )
-                    
+
                     if selected_voice:
                         voice_config['voice_id'] = voice_options[selected_voice]
-                        
-                except Exception as e:
-                    st.warning(f"Could not load voices: {e}")
+                else:
                     voice_config['voice_id'] = st.text_input(
                         "Voice ID",
                         value=voice_config.get('voice_id', 'JBFqnCBsd6RMkjVDRZzb'),
@@ -406,18 +777,12 @@ class AgentBuilder:
             )
         
         with col_asr2:
-            if asr_config.get('provider') == 'openai':
-                asr_config['model'] = st.selectbox(
-                    "ASR Model",
-                    options=['whisper-1'],
-                    index=0
-                )
-            else:
-                asr_config['model'] = st.selectbox(
-                    "ASR Model",
-                    options=['nova-2', 'nova-1'],
-                    index=0
-                )
+            asr_config['model'] = st.selectbox(
+                "ASR Model",
+                options=ASR_MODEL_OPTIONS.get(asr_config.get('provider'),
+                                              ASR_MODEL_OPTIONS['elevenlabs']),
+                index=0
+            )
         
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -477,7 +842,7 @@ class AgentBuilder:
         turn_config = config.setdefault('turn_detection', {})
         
         col_turn1, col_turn2 = st.columns(2)
-        
+
         with col_turn1:
             turn_config['type'] = st.selectbox(
                 "Detection Type",
@@ -485,35 +850,13 @@ class AgentBuilder:
                 index=0,
                 help="Method for detecting when user stops speaking"
             )
-            
-            if turn_config['type'] == 'server_vad':
-                turn_config['threshold'] = st.slider(
-                    "VAD Threshold",
-                    min_value=0.0,
-                    max_value=1.0,
-                    value=turn_config.get('threshold', 0.5),
-                    step=0.05,
-                    help="Voice activity detection sensitivity"
-                )
-        
-        with col_turn2:
-            if turn_config['type'] == 'server_vad':
-                turn_config['prefix_padding_ms'] = st.number_input(
-                    "Prefix Padding (ms)",
-                    min_value=0,
-                    max_value=1000,
-                    value=turn_config.get('prefix_padding_ms', 300),
-                    help="Audio padding before speech detection"
-                )
-                
-                turn_config['silence_duration_ms'] = st.number_input(
-                    "Silence Duration (ms)",
-                    min_value=500,
-                    max_value=5000,
-                    value=turn_config.get('silence_duration_ms', 1000),
-                    help="Silence duration to trigger turn end"
-                )
-        
+
+        # Per-type widgets via table dispatch; only the relevant subtree
+        # is built, and new detection types just add a renderer entry
+        renderer = _TURN_RENDERERS.get(turn_config['type'])
+        if renderer:
+            renderer(turn_config, col_turn1, col_turn2)
+
         st.markdown('</div>', unsafe_allow_html=True)
     
     def render_tools_settings(self):
@@ -521,8 +864,10 @@ class AgentBuilder:
         st.markdown('<div class="config-section">', unsafe_allow_html=True)
         
         st.subheader("🛠️ Tools & Actions")
-        
-        # Load available tools
+
+        # Load available tools (cached); the button forces a refetch
+        if st.button("🔄 Refresh Tools"):
+            _fetch_tools.clear()
         self.load_available_tools()
         
         # Tool tabs
@@ -547,9 +892,11 @@ class AgentBuilder:
         
         config = st.session_state.current_agent_config
         selected_tools = config.setdefault('tools', [])
-        
+        # One pass up front for O(1) membership checks in the loop below
+        selected_el_ids = {t.get('tool_id') for t in selected_tools if t.get('type') == 'elevenlabs'}
+
         st.write("Select tools to add to your agent:")
-        
+
         for tool in st.session_state.available_tools:
             tool_id = tool.get('tool_id', tool.get('id', ''))
             tool_name = tool.get('name', 'Unknown Tool')
@@ -565,21 +912,19 @@ class AgentBuilder:
                 </div>
                 """, unsafe_allow_html=True)
                 
-                is_selected = any(t.get('tool_id') == tool_id for t in selected_tools)
-                
-                if st.checkbox(f"Use {tool_name}", value=is_selected, key=f"tool_{tool_id}"):
-                    if not is_selected:
-                        selected_tools.append({
-                            'tool_id': tool_id,
-                            'name': tool_name,
-                            'description': tool_desc,
-                            'type': 'elevenlabs'
-                        })
-                        config['tools'] = selected_tools
-                else:
-                    if is_selected:
-                        selected_tools[:] = [t for t in selected_tools if t.get('tool_id') != tool_id]
-                        config['tools'] = selected_tools
+                is_selected = tool_id in selected_el_ids
+                now_selected = st.checkbox(f"Use {tool_name}", value=is_selected, key=f"tool_{tool_id}")
+
+                # Only mutate the selection when the checkbox actually flipped
+                if now_selected and not is_selected:
+                    selected_tools.append({
+                        'tool_id': tool_id,
+                        'name': tool_name,
+                        'description': tool_desc,
+                        'type': 'elevenlabs'
+                    })
+                elif not now_selected and is_selected:
+                    selected_tools[:] = [t for t in selected_tools if t.get('tool_id') != tool_id]
     
     def render_custom_tools(self):
         """Render custom tools management"""
@@ -587,8 +932,14 @@ class AgentBuilder:
         
         config = st.session_state.current_agent_config
         selected_tools = config.setdefault('tools', [])
-        
+        # One pass up front for O(1) membership checks in the loop below
+        selected_custom_ids = {t.get('custom_id') for t in selected_tools if t.get('type') == 'custom'}
+
         for i, tool in enumerate(st.session_state.custom_tools):
+            # Key widgets by the tool's stable id, not its list position:
+            # positional keys shift on delete and make Streamlit rebind
+            # widget state across the whole list
+            uid = tool.get('id', i)
             with st.container():
                 st.markdown(f"""
                 <div class="tool-card">
@@ -605,25 +956,24 @@ class AgentBuilder:
                 
                 col1, col2 = st.columns(2)
                 with col1:
-                    is_selected = any(t.get('custom_id') == tool.get('id') for t in selected_tools)
-                    if st.checkbox(f"Use {tool['name']}", value=is_selected, key=f"custom_tool_{i}"):
-                        if not is_selected:
-                            selected_tools.append({
-                                'custom_id': tool.get('id'),
-                                'name': tool['name'],
-                                'description': tool['description'],
-                                'type': 'custom',
-                                'config': tool
-                            })
-                            config['tools'] = selected_tools
-                    else:
-                        if is_selected:
-                            selected_tools[:] = [t for t in selected_tools 
-                                               if t.get('custom_id') != tool.get('id')]
-                            config['tools'] = selected_tools
+                    is_selected = tool.get('id') in selected_custom_ids
+                    now_selected = st.checkbox(f"Use {tool['name']}", value=is_selected, key=f"custom_tool_{uid}")
+
+                    # Only mutate the selection when the checkbox actually flipped
+                    if now_selected and not is_selected:
+                        selected_tools.append({
+                            'custom_id': tool.get('id'),
+                            'name': tool['name'],
+                            'description': tool['description'],
+                            'type': 'custom',
+                            'config': tool
+                        })
+                    elif not now_selected and is_selected:
+                        selected_tools[:] = [t for t in selected_tools
+                                           if t.get('custom_id') != tool.get('id')]
                 
                 with col2:
-                    if st.button(f"Delete {tool['name']}", key=f"delete_custom_{i}"):
+                    if st.button(f"Delete {tool['name']}", key=f"delete_custom_{uid}"):
                         st.session_state.custom_tools.pop(i)
                         st.rerun()
     
@@ -716,6 +1066,24 @@ class AgentBuilder:
             
             if st.form_submit_button("Create Tool", type="primary"):
                 if tool_name and tool_description:
+                    if tool_type == "function":
+                        json_blobs = (("Parameters", parameters_json, 'parameters'),)
+                    elif tool_type == "webhook":
+                        json_blobs = (("Headers", headers_json, 'headers'),)
+                    elif tool_type == "api_call":
+                        json_blobs = (("Headers", api_headers, 'headers'),
+                                      ("Request parameters", api_params, 'parameters'))
+                    else:
+                        json_blobs = ()
+
+                    for label, text, schema_key in json_blobs:
+                        if not text.strip():
+                            continue
+                        error = _validate_tool_json(text, schema_key)
+                        if error:
+                            st.error(f"{label} invalid: {error}")
+                            return
+
                     tool_config = {
                         'id': str(uuid.uuid4()),
                         'name': tool_name,
@@ -757,7 +1125,30 @@ class AgentBuilder:
         
         config = st.session_state.current_agent_config
         kb_config = config.setdefault('knowledge_base', {})
-        
+
+        # Apply a removal requested on the previous rerun up front: one
+        # filter pass here instead of pop(i) mid-iteration, which shifted
+        # every later entry and invalidated their widget positions
+        pending = st.session_state.pop('_pending_kb_remove', None)
+        if pending is not None:
+            kb_files = kb_config.get('files', [])
+            removed = [f for f in kb_files if f.get('_uid') == pending]
+            kb_config['files'] = [f for f in kb_files if f.get('_uid') != pending]
+            kb_config.pop('_names', None)
+            # Unlink the staged temp file too; otherwise removed uploads
+            # accumulate on disk for the life of the process
+            for file_info in removed:
+                path = file_info.get('path')
+                if path:
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+            if removed:
+                # lru_cache has no per-key eviction; dropping the whole
+                # cache is cheap since surviving files re-read on demand
+                _load_kb_text.cache_clear()
+
         st.subheader("📚 Knowledge Base")
         
         kb_config['enabled'] = st.checkbox(
@@ -778,34 +1169,55 @@ class AgentBuilder:
             )
             
             if uploaded_files:
+                # Deferred: only the upload path needs them
+                import shutil
+                import tempfile
+
                 kb_files = kb_config.setdefault('files', [])
+                # O(1) duplicate checks instead of scanning kb_files per
+                # upload; rebuilt cheaply if dropped by serialization
+                kb_names = kb_config.get('_names')
+                if kb_names is None or len(kb_names) != len(kb_files):
+                    kb_names = kb_config['_names'] = {f['name'] for f in kb_files}
+
                 for file in uploaded_files:
-                    file_info = {
+                    # Check if file already exists
+                    if file.name in kb_names:
+                        continue
+                    kb_names.add(file.name)
+
+                    # Stream the upload to a temp file in bounded 1 MiB
+                    # chunks; session state keeps only the path and
+                    # metadata, never the decoded payload
+                    suffix = os.path.splitext(file.name)[1]
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                        file.seek(0)
+                        shutil.copyfileobj(file, tmp, length=1 << 20)
+
+                    kb_files.append({
+                        '_uid': uuid.uuid4().hex,
                         'name': file.name,
                         'type': file.type,
                         'size': file.size,
-                        'content': file.read().decode('utf-8') if file.type == 'text/plain' else None
-                    }
-                    
-                    # Check if file already exists
-                    if not any(f['name'] == file.name for f in kb_files):
-                        kb_files.append(file_info)
-                        st.success(f"Added {file.name} to knowledge base")
-                
-                kb_config['files'] = kb_files
+                        'path': tmp.name
+                    })
+                    st.success(f"Added {file.name} to knowledge base")
             
             # Display current files
-            if kb_config.get('files'):
+            # Pull the list once; repeated kb_config[...] lookups add up
+            # at rerun cadence
+            kb_file_list = kb_config.get('files')
+            if kb_file_list:
                 st.subheader("Current Knowledge Files")
-                for i, file_info in enumerate(kb_config['files']):
+                for i, file_info in enumerate(kb_file_list):
                     col1, col2, col3 = st.columns([2, 1, 1])
                     with col1:
                         st.write(f"📄 {file_info['name']}")
                     with col2:
                         st.write(f"{file_info.get('size', 0)} bytes")
                     with col3:
-                        if st.button("Remove", key=f"remove_kb_file_{i}"):
-                            kb_config['files'].pop(i)
+                        if st.button("Remove", key=f"remove_kb_file_{file_info.get('_uid', i)}"):
+                            st.session_state['_pending_kb_remove'] = file_info.get('_uid')
                             st.rerun()
             
             # Web scraping
@@ -918,7 +1330,8 @@ class AgentBuilder:
         
         if st.button("Show Configuration JSON"):
             st.markdown('<div class="config-preview">', unsafe_allow_html=True)
-            st.code(json.dumps(config, indent=2), language='json')
+            cfg_compact = json.dumps(config, sort_keys=True, separators=(',', ':'))
+            st.code(_config_preview_json(cfg_compact), language='json')
             st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -958,20 +1371,16 @@ class AgentBuilder:
         st.subheader("💬 Test Conversation")
         
         # Display conversation history
-        if st.session_state.test_conversation:
-            for message in st.session_state.test_conversation:
-                if message['role'] == 'user':
-                    st.markdown(f"""
-                    <div class="conversation-bubble user-bubble">
-                        <strong>You:</strong> {message['content']}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="conversation-bubble agent-bubble">
-                        <strong>Agent:</strong> {message['content']}
-                    </div>
-                    """, unsafe_allow_html=True)
+        conversation = st.session_state.test_conversation
+        if conversation:
+            # One markdown element for the whole history instead of one
+            # frontend element (and websocket frame) per message; content
+            # is escaped since this bypasses per-message rendering
+            parts = []
+            for message in conversation:
+                template = _USER_BUBBLE if message['role'] == 'user' else _AGENT_BUBBLE
+                parts.append(template.format(escape(message['content'])))
+            st.markdown("\n".join(parts), unsafe_allow_html=True)
         
         # Test input
         with st.form("test_message_form"):
@@ -981,19 +1390,22 @@ class AgentBuilder:
             with col1:
                 if st.form_submit_button("Send Message", type="primary"):
                     if test_message:
+                        # One timestamp for the exchange
+                        now = datetime.now().isoformat()
+
                         # Add user message
                         st.session_state.test_conversation.append({
                             'role': 'user',
                             'content': test_message,
-                            'timestamp': datetime.now().isoformat()
+                            'timestamp': now
                         })
-                        
+
                         # Simulate agent response
                         agent_response = self.simulate_agent_response(test_message)
                         st.session_state.test_conversation.append({
                             'role': 'agent',
                             'content': agent_response,
-                            'timestamp': datetime.now().isoformat()
+                            'timestamp': now
                         })
                         
                         st.rerun()
@@ -1023,13 +1435,11 @@ class AgentBuilder:
         """Load available tools from ElevenLabs API"""
         if not self.client:
             return
-        
+
         try:
-            tools_response = self.client.conversational_ai.tools.list()
-            if hasattr(tools_response, 'tools'):
-                st.session_state.available_tools = tools_response.tools
-            else:
-                st.session_state.available_tools = []
+            api_key = st.session_state.get('elevenlabs_api_key', '')
+            key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+            st.session_state.available_tools = _fetch_tools(key_hash, self.client)
         except Exception as e:
             st.warning(f"Could not load tools: {e}")
             st.session_state.available_tools = []
@@ -1040,13 +1450,30 @@ class AgentBuilder:
         agent_id = config.get('id', str(uuid.uuid4()))
         
         # Add metadata
+        now = datetime.now().isoformat()
         config['id'] = agent_id
-        config['created_at'] = config.get('created_at', datetime.now().isoformat())
-        config['updated_at'] = datetime.now().isoformat()
-        
+        config['created_at'] = config.get('created_at', now)
+        config['updated_at'] = now
+
+        # Re-render the list card here, at mutation time, so the agent
+        # list render path is a cached-string emission; the HTML lives
+        # only in agents_summary so the config dict (shown, exported and
+        # synced to Supabase) stays clean
+        card_html = _build_agent_card_html(config)
+
         # Save to session state
         st.session_state.agents[agent_id] = config.copy()
-        
+
+        # Keep the read-optimized list in step with the full store
+        summary = st.session_state.setdefault('agents_summary', [])
+        entry = (agent_id, card_html)
+        for i, (existing_id, _) in enumerate(summary):
+            if existing_id == agent_id:
+                summary[i] = entry
+                break
+        else:
+            summary.append(entry)
+
         st.success(f"Agent '{config['name']}' saved successfully!")
     
     def deploy_agent(self, agent_id: str, agent_data: Dict[str, Any]):
@@ -1071,6 +1498,42 @@ class AgentBuilder:
         except Exception as e:
             st.error(f"Deployment failed: {e}")
     
+    async def _deploy_many(self, items):
+        """Deploy several agents concurrently over one async client.
+
+        Fan-out keeps total latency at one round-trip instead of the sum;
+        return_exceptions=True lets the rest of a batch land when one
+        deploy fails.
+        """
+        client = AsyncElevenLabs(api_key=st.session_state.get('elevenlabs_api_key'))
+        tasks = [
+            client.conversational_ai.agents.create(
+                conversation_config=self.convert_to_elevenlabs_config(agent_data),
+                name=agent_data.get('name'),
+                tags=agent_data.get('tags', [])
+            )
+            for _agent_id, agent_data in items
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def deploy_all_agents(self):
+        """Deploy every saved agent with one concurrent fan-out"""
+        if not self.client:
+            st.error("Please connect with API key to deploy agents")
+            return
+
+        items = list(st.session_state.agents.items())
+        if not items:
+            st.info("No agents to deploy")
+            return
+
+        results = asyncio.run(self._deploy_many(items))
+        for (_agent_id, agent_data), result in zip(items, results):
+            if isinstance(result, Exception):
+                st.error(f"Deployment failed for '{agent_data.get('name')}': {result}")
+            else:
+                st.success(f"Agent '{agent_data.get('name')}' deployed! Agent ID: {result.agent_id}")
+
     def deploy_current_agent(self):
         """Deploy the current agent configuration"""
         config = st.session_state.current_agent_config
@@ -1088,31 +1551,18 @@ class AgentBuilder:
     def export_agent_config(self):
         """Export agent configuration as JSON"""
         config = st.session_state.current_agent_config
-        config_json = json.dumps(config, indent=2)
-        
+
+        # Bytes straight to the download button; skips a decode round-trip
         st.download_button(
             label="Download Configuration",
-            data=config_json,
+            data=_dumps_pretty(config),
             file_name=f"{config.get('name', 'agent')}_config.json",
             mime="application/json"
         )
     
     def simulate_agent_response(self, message: str) -> str:
         """Simulate agent response for testing"""
-        config = st.session_state.current_agent_config
-        system_prompt = config.get('conversation', {}).get('system_prompt', '')
-        
-        # Simple response simulation
-        responses = [
-            "I understand your message. How can I help you further?",
-            "That's interesting! Can you tell me more about that?",
-            "Based on my configuration, I would suggest...",
-            "Let me think about that for a moment...",
-            "I'm here to help! What would you like to know?",
-        ]
-        
-        import random
-        return random.choice(responses)
+        return _SIM_RESPONSES[random.randrange(len(_SIM_RESPONSES))]
     
     def show_test_analytics(self):
         """Show test conversation analytics"""
@@ -1123,69 +1573,37 @@ class AgentBuilder:
             return
         
         st.subheader("📊 Test Analytics")
-        
+
+        # One pass over the conversation for all role counts
+        counts = Counter(m['role'] for m in conversation)
+
         col1, col2, col3 = st.columns(3)
-        
+
         with col1:
-            st.metric("User Messages", user_messages)
-        
+            st.metric("User Messages", counts['user'])
+
         with col2:
-            agent_messages = len([m for m in conversation if m['role'] == 'agent'])
-            st.metric("Agent Messages", agent_messages)
-            
+            st.metric("Agent Messages", counts['agent'])
+
         with col3:
-            total_messages = len(conversation)
-            st.metric("Total Messages", total_messages)
+            st.metric("Total Messages", len(conversation))
 
     def convert_to_elevenlabs_config(self, config: Dict[str, Any]) -> 'ConversationalConfig':
         """Convert internal config to ElevenLabs ConversationalConfig"""
         try:
-            # Extract config sections
-            conv_config = config.get('conversation', {})
-            voice_config = config.get('voice', {})
-            asr_config = config.get('asr', {})
-            turn_config = config.get('turn_detection', {})
-            
-            # TTS Config
-            tts_config = TtsConversationalConfigOutput(
-                voice_id=voice_config.get('voice_id', 'JBFqnCBsd6RMkjVDRZzb'),
-                model_id=voice_config.get('model_id', 'eleven_turbo_v2_5'),
-            )
-            
-            # Conversation Config
-            conversation_config = ConversationConfig(
-                max_duration_seconds=conv_config.get('max_duration_seconds', 600),
-                client_events=["audio", "interruption"],
-            )
-            
-            # ASR Config
-            asr_settings = AsrConversationalConfig(
-                quality="high",
-                provider=asr_config.get('provider', 'elevenlabs'),
-                user_input_audio_format="pcm_16000"
-            )
-            
-            # Turn Config
-            turn_settings = TurnConfig(
-                turn_timeout=float(conv_config.get('time_out_seconds', 30)),
-                mode=turn_config.get('type', 'server_vad')
-            )
-            
-            # Construct main config
-            return ConversationalConfig(
-                agent=AgentConfig(
-                    prompt={
-                        "prompt": conv_config.get('system_prompt', 'You are a helpful assistant.')
-                    },
-                    first_message=conv_config.get('first_message', 'Hello!'),
-                    language=conv_config.get('language', 'en')
-                ),
-                tts=tts_config,
-                conversation=conversation_config,
-                asr=asr_settings,
-                turn=turn_settings
+            # Key the cached builder on the sections the mapping reads,
+            # so redeploys of an unchanged config skip the pydantic
+            # validator chain entirely
+            sections = {
+                'conversation': config.get('conversation', {}),
+                'voice': config.get('voice', {}),
+                'asr': config.get('asr', {}),
+                'turn_detection': config.get('turn_detection', {}),
+            }
+            return _build_conversational_config(
+                json.dumps(sections, sort_keys=True, separators=(',', ':'))
             )
-            
+
         except Exception as e:
             st.error(f"Config conversion error: {e}")
             return None
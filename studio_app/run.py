@@ -3,6 +3,7 @@
 Launch script for ElevenLabs Studio App
 """
 
+import importlib.util
 import os
 import subprocess
 import sys
@@ -33,12 +34,12 @@ def main():
     app_dir = Path(__file__).parent
     os.chdir(app_dir)
     
-    # Install requirements if needed
-    try:
-        import streamlit
-
-        import elevenlabs
-    except ImportError:
+    # Install requirements if needed; find_spec only probes for the
+    # packages instead of importing them, so launches with everything
+    # already installed skip the full SDK import chain
+    missing = [pkg for pkg in ("streamlit", "elevenlabs")
+               if importlib.util.find_spec(pkg) is None]
+    if missing:
         print("Missing dependencies. Installing...")
         install_requirements()
     
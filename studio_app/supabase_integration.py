@@ -3,8 +3,15 @@ Supabase Integration for ElevenLabs Studio
 Provides authentication, database, and real-time features
 """
 
+import functools
+import hashlib
 import json
-from datetime import datetime
+import queue
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from string import Template
 from typing import Dict, List, Optional
 
 import streamlit as st
@@ -18,6 +25,102 @@ except ImportError as e:
     st.error("Supabase package not found. Install with: pip install supabase")
     st.stop()
 
+# Async client (newer supabase-py); used to overlap independent reads
+try:
+    from supabase import acreate_client
+except ImportError:
+    acreate_client = None
+
+# Optional: inject a keep-alive httpx client so repeated calls reuse one
+# TLS connection instead of paying the handshake each time
+try:
+    import httpx
+    from supabase import ClientOptions
+except ImportError:
+    httpx = None
+    ClientOptions = None
+
+# Optional faster JSON serializer for the config viewer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _get_supabase_client(url: str, key: str) -> Client:
+    """One client per browser session, reused across reruns.
+
+    The client carries the auth session and injects its JWT into every
+    postgrest call, so it must NOT be shared across sessions (a
+    process-wide cache_resource client would let one user's sign-in
+    overwrite another's token and run their queries under the wrong RLS
+    identity). Keeping it in session_state still avoids rebuilding the
+    client — and its keep-alive connection pool — on every rerun.
+    """
+    cached = st.session_state.get('_supabase_client')
+    if cached is not None and st.session_state.get('_supabase_client_key') == (url, key):
+        return cached
+    client = _build_supabase_client(url, key)
+    st.session_state['_supabase_client'] = client
+    st.session_state['_supabase_client_key'] = (url, key)
+    return client
+
+
+def _build_supabase_client(url: str, key: str) -> Client:
+    if httpx is not None and ClientOptions is not None:
+        try:
+            options = ClientOptions(
+                postgrest_client_timeout=10,
+                storage_client_timeout=10,
+                httpx_client=httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=20,
+                                        keepalive_expiry=40),
+                ),
+            )
+            return create_client(url, key, options=options)
+        except (TypeError, ImportError):
+            # Older supabase-py without httpx_client support, or h2 missing
+            pass
+    return create_client(url, key)
+
+
+def _retry_db_operation(func):
+    """Retry transient DB failures with exponential backoff plus jitter"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        delay = 0.5
+        for attempt in range(3):
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                if attempt == 2:
+                    raise
+                time.sleep(delay + random.uniform(0, delay / 2))
+                delay *= 2
+    return wrapper
+
+
+@st.cache_resource(show_spinner=False)
+def _get_io_pool() -> ThreadPoolExecutor:
+    """Shared pool for fire-and-forget writes off the script thread"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix='supabase-io')
+
+
+# Errors from background writes; drained into st.error on the next rerun
+# because worker threads cannot touch Streamlit directly
+_write_errors: "queue.Queue[str]" = queue.Queue()
+
+
+def drain_write_errors():
+    """Surface any errors from background writes on the current rerun"""
+    try:
+        while True:
+            st.error(_write_errors.get_nowait())
+    except queue.Empty:
+        pass
+
+
 class SupabaseManager:
     def load_elevenlabs_api_key(self) -> Optional[str]:
         """Load ElevenLabs API key from Supabase for current user and set in session state automatically"""
@@ -37,6 +140,9 @@ class SupabaseManager:
                 api_key = response.data[0].get('api_key')
                 if api_key:
                     st.session_state['api_key'] = api_key
+                    # Fingerprint lets save_elevenlabs_api_key skip the
+                    # upsert when the key hasn't actually changed
+                    st.session_state['_api_key_sha'] = hashlib.sha256(api_key.encode()).hexdigest()
             return api_key
         except Exception as e:
             # Silent failure is better here to avoid annoying popups on startup
@@ -48,17 +154,32 @@ class SupabaseManager:
         try:
             if not self.client or not self.user:
                 return False
-            
-            # Upsert api key
+
+            # Zero-write when the key is unchanged: no WAL record, no
+            # realtime fanout for the common re-save on page load
+            key_sha = hashlib.sha256(api_key.encode()).hexdigest()
+            if st.session_state.get('_api_key_sha') == key_sha:
+                return True
+
+            # Upsert api key; updated_at comes from the DB trigger
             data = {
                 'user_id': self.user.id,
                 'api_key': api_key,
-                'updated_at': datetime.now().isoformat()
+                'api_key_sha': key_sha
             }
-            
-            response = self.client.table('api_keys').upsert(data).execute()
-            return len(response.data) > 0
-            
+
+            try:
+                response = self.client.table('api_keys').upsert(data).execute()
+            except Exception:
+                # Older schema without the api_key_sha column
+                del data['api_key_sha']
+                response = self.client.table('api_keys').upsert(data).execute()
+
+            if len(response.data) > 0:
+                st.session_state['_api_key_sha'] = key_sha
+                return True
+            return False
+
         except Exception as e:
             st.error(f"Error saving API key: {e}")
             return False
@@ -70,6 +191,7 @@ class SupabaseManager:
         self.key = None
         self.user = None
         self.session = None
+        self._realtime_channel = None
     
     def initialize(self, url: str, key: str) -> bool:
         """Initialize Supabase client with URL and API key"""
@@ -77,16 +199,10 @@ class SupabaseManager:
             self.url = url
             self.key = key
 
-            # Create Supabase client
-            self.client = create_client(url, key)
-
-            # Test connection
-            if self.client is not None:
-                try:
-                    response = self.client.table('test').select('*').limit(1).execute()
-                except Exception:
-                    # Table 'test' may not exist, ignore this error
-                    pass
+            # Session-scoped client; no table probe — create_client validates
+            # the URL/key shape and real queries surface auth errors anyway
+            self.client = _get_supabase_client(url, key)
+            self._start_realtime_sync()
 
             st.session_state.supabase_client = self.client
             st.session_state.supabase_connected = True
@@ -95,6 +211,25 @@ class SupabaseManager:
             st.error(f"Failed to connect to Supabase: {e}")
             return False
 
+    def _start_realtime_sync(self):
+        """Invalidate the cloud-data cache when agent_configs changes.
+
+        With this subscribed, steady-state reads come from the cache and a
+        refetch only happens after an actual INSERT/UPDATE/DELETE instead
+        of on every TTL expiry. Best-effort: realtime needs websocket
+        support, and any failure just leaves the TTL refresh in place.
+        """
+        try:
+            channel = self.client.channel('public:agent_configs')
+            channel.on_postgres_changes(
+                event='*', schema='public', table='agent_configs',
+                callback=lambda payload: _fetch_cloud_data_cached.clear()
+            )
+            channel.subscribe()
+            self._realtime_channel = channel
+        except Exception:
+            self._realtime_channel = None
+
     def sign_up(self, email: str, password: str, metadata: Optional[Dict] = None) -> bool:
         """Sign up a new user"""
         try:
@@ -149,7 +284,10 @@ class SupabaseManager:
         try:
             if not self.client:
                 return False
-            
+
+            # Don't lose buffered usage events when the session ends
+            flush_usage_buffer()
+
             self.client.auth.sign_out()
             self.user = None
             self.session = None
@@ -182,33 +320,60 @@ class SupabaseManager:
             if not self.client or not self.user:
                 return False
             
+            # Upsert on (user_id, agent_name) so repeated saves of the same
+            # agent update one row instead of growing the table; timestamps
+            # come from the DB default and the moddatetime trigger
             data = {
                 'user_id': self.user.id,
                 'agent_name': agent_config.get('name', 'Untitled Agent'),
-                'config': agent_config,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'config': agent_config
             }
-            
-            response = self.client.table('agent_configs').insert(data).execute()
-            return len(response.data) > 0
-            
+
+            try:
+                response = self.client.table('agent_configs').upsert(data, on_conflict='user_id,agent_name').execute()
+            except Exception:
+                # Older schema without the agent_configs_user_name_uniq
+                # index: ON CONFLICT has nothing to match, so fall back to
+                # a plain insert (one row per save, as before)
+                response = self.client.table('agent_configs').insert(data).execute()
+            if len(response.data) > 0:
+                _fetch_cloud_data_cached.clear()
+                return True
+            return False
+
         except Exception as e:
             st.error(f"Error saving agent config: {e}")
             return False
     
     def load_agent_configs(self) -> List[Dict]:
-        """Load user's agent configurations"""
+        """Load user's agent configurations (list columns only)
+
+        The JSONB config blob is excluded; fetch it per agent with
+        load_agent_config() when actually needed.
+        """
         try:
             if not self.client or not self.user:
                 return []
-            
-            response = self.client.table('agent_configs').select('*').eq('user_id', self.user.id).execute()
+
+            response = self.client.table('agent_configs').select('id,agent_name,created_at,updated_at').eq('user_id', self.user.id).execute()
             return response.data or []
-            
+
         except Exception as e:
             st.error(f"Error loading agent configs: {e}")
             return []
+
+    def load_agent_config(self, config_id: str) -> Optional[Dict]:
+        """Load one agent's full config blob on demand"""
+        try:
+            if not self.client or not self.user:
+                return None
+
+            response = self.client.table('agent_configs').select('config').eq('id', config_id).eq('user_id', self.user.id).single().execute()
+            return (response.data or {}).get('config')
+
+        except Exception as e:
+            st.error(f"Error loading agent config: {e}")
+            return None
     
     def delete_agent_config(self, config_id: str) -> bool:
         """Delete an agent configuration"""
@@ -217,90 +382,206 @@ class SupabaseManager:
                 return False
             
             response = self.client.table('agent_configs').delete().eq('id', config_id).eq('user_id', self.user.id).execute()
-            return len(response.data) > 0
-            
+            if len(response.data) > 0:
+                _fetch_cloud_data_cached.clear()
+                return True
+            return False
+
         except Exception as e:
             st.error(f"Error deleting agent config: {e}")
             return False
-    
-    # Removed duplicate empty function definition
-    def save_conversation(self, conversation_data: Dict) -> bool:
-        """Save conversation history"""
+
+    def delete_agent_configs(self, config_ids: List[str]) -> bool:
+        """Delete several agent configurations in one request"""
         try:
-            if not self.client or not self.user:
+            if not self.client or not self.user or not config_ids:
                 return False
 
-            data = {
-                'user_id': self.user.id,
-                'agent_id': conversation_data.get('agent_id'),
-                'messages': conversation_data.get('messages', []),
-                'metadata': conversation_data.get('metadata', {}),
-                'created_at': datetime.now().isoformat()
-            }
+            response = self.client.table('agent_configs').delete().in_('id', config_ids).eq('user_id', self.user.id).execute()
+            if len(response.data) > 0:
+                _fetch_cloud_data_cached.clear()
+                return True
+            return False
 
-            response = self.client.table('conversations').insert(data).execute()
-            return len(response.data) > 0
+        except Exception as e:
+            st.error(f"Error deleting agent configs: {e}")
+            return False
+    
+    # Removed duplicate empty function definition
+    @_retry_db_operation
+    def _execute_insert(self, table: str, data):
+        self.client.table(table).insert(data).execute()
 
+    def _insert_rows(self, table: str, data):
+        """Blocking insert; runs on the I/O pool, errors go to the drain queue"""
+        try:
+            self._execute_insert(table, data)
         except Exception as e:
-            st.error(f"Error saving conversation: {e}")
+            _write_errors.put(f"Error saving to {table}: {e}")
+
+    def save_conversation(self, conversation_data: Dict) -> bool:
+        """Queue conversation save; the rerun doesn't wait on the network"""
+        if not self.client or not self.user:
             return False
 
-    def get_conversations(self, agent_id: Optional[str] = None) -> List[Dict]:
-        """Get conversation history"""
+        data = {
+            'user_id': self.user.id,
+            'agent_id': conversation_data.get('agent_id'),
+            'messages': conversation_data.get('messages', []),
+            'metadata': conversation_data.get('metadata', {})
+        }
+
+        _get_io_pool().submit(self._insert_rows, 'conversations', data)
+        return True
+
+    def get_conversations(self, agent_id: Optional[str] = None,
+                          limit: int = 10, offset: int = 0) -> List[Dict]:
+        """Get a page of conversation history, newest first"""
         try:
             if not self.client or not self.user:
                 return []
 
-            query = self.client.table('conversations').select('*').eq('user_id', self.user.id)
+            # Messages arrays can be large; the list view only needs the
+            # envelope, message bodies load lazily per conversation
+            query = self.client.table('conversations').select('id,agent_id,created_at,metadata').eq('user_id', self.user.id)
 
             if agent_id is not None:
                 query = query.eq('agent_id', agent_id)
 
-            response = query.order('created_at', desc=True).execute()
+            # Paginate in Postgres so transfer stays O(limit) no matter
+            # how much history accumulates
+            response = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             return response.data or []
 
         except Exception as e:
             st.error(f"Error loading conversations: {e}")
             return []
-    def save_usage_metrics(self, metrics: Dict) -> bool:
-        """Save usage metrics and analytics"""
+
+    def get_conversation_messages(self, conversation_id: str) -> List[Dict]:
+        """Load one conversation's message array on demand"""
         try:
             if not self.client or not self.user:
-                return False
-            
-            data = {
-                'user_id': self.user.id,
-                'feature_used': metrics.get('feature'),
-                'usage_count': metrics.get('count', 1),
-                'metadata': metrics.get('metadata', {}),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            response = self.client.table('usage_metrics').insert(data).execute()
-            return len(response.data) > 0
-            
+                return []
+
+            response = self.client.table('conversations').select('messages').eq('id', conversation_id).eq('user_id', self.user.id).single().execute()
+            return (response.data or {}).get('messages', [])
+
         except Exception as e:
-            st.error(f"Error saving usage metrics: {e}")
+            st.error(f"Error loading conversation: {e}")
+            return []
+    def save_usage_metrics(self, metrics: Dict) -> bool:
+        """Queue usage metrics save; fire-and-forget like save_conversation"""
+        if not self.client or not self.user:
             return False
+
+        data = {
+            'user_id': self.user.id,
+            'feature_used': metrics.get('feature'),
+            'usage_count': metrics.get('count', 1),
+            'metadata': metrics.get('metadata', {})
+        }
+
+        _get_io_pool().submit(self._insert_rows, 'usage_metrics', data)
+        return True
     
+    def get_feature_usage(self) -> Dict[str, int]:
+        """Get per-feature usage totals, aggregated server-side"""
+        try:
+            if not self.client or not self.user:
+                return {}
+
+            # GROUP BY runs in Postgres (user_feature_usage view), so only
+            # one row per distinct feature comes over the wire
+            try:
+                response = self.client.table('user_feature_usage').select('feature_used,total').eq('user_id', self.user.id).execute()
+                return {row['feature_used']: row['total'] for row in response.data or []}
+            except Exception:
+                # View not installed yet; aggregate client-side
+                pass
+
+            response = self.client.table('usage_metrics').select('feature_used,usage_count').eq('user_id', self.user.id).execute()
+            feature_usage: Dict[str, int] = {}
+            for metric in response.data or []:
+                feature = metric.get('feature_used', 'Unknown')
+                feature_usage[feature] = feature_usage.get(feature, 0) + metric.get('usage_count', 1)
+            return feature_usage
+
+        except Exception as e:
+            st.error(f"Error loading feature usage: {e}")
+            return {}
+
+    def fetch_cloud_data(self) -> Dict:
+        """Fetch agents, conversations and feature usage for the cloud tabs.
+
+        The three reads are independent, so when the async client is
+        available they run concurrently and total latency is the slowest
+        call rather than the sum of all three.
+        """
+        if acreate_client is not None and self.user:
+            try:
+                return asyncio.run(self._fetch_cloud_data_async())
+            except Exception:
+                # Fall back to the serial path on any async failure
+                pass
+        return {
+            'agents': self.load_agent_configs(),
+            'conversations': self.get_conversations(),
+            'feature_usage': self.get_feature_usage(),
+        }
+
+    async def _fetch_cloud_data_async(self) -> Dict:
+        client = await acreate_client(self.url, self.key)
+        if self.session:
+            client.postgrest.auth(self.session.access_token)
+        uid = self.user.id
+        agents, convs, usage = await asyncio.gather(
+            client.table('agent_configs').select('id,agent_name,created_at,updated_at').eq('user_id', uid).execute(),
+            client.table('conversations').select('id,agent_id,created_at,metadata').eq('user_id', uid).order('created_at', desc=True).limit(10).execute(),
+            client.table('user_feature_usage').select('feature_used,total').eq('user_id', uid).execute(),
+            return_exceptions=True
+        )
+        return {
+            'agents': [] if isinstance(agents, BaseException) else agents.data or [],
+            'conversations': [] if isinstance(convs, BaseException) else convs.data or [],
+            'feature_usage': {} if isinstance(usage, BaseException) else {
+                row['feature_used']: row['total'] for row in usage.data or []
+            },
+        }
+
     def get_user_analytics(self) -> Dict:
         """Get user analytics and usage statistics"""
         try:
             if not self.client or not self.user:
                 return {}
             
-            # Get usage metrics
-            response = self.client.table('usage_metrics').select('*').eq('user_id', self.user.id).execute()
+            # One RPC returns all three datasets in a single round-trip
+            # (see analytics_summary in create_database_schema)
+            try:
+                summary = self.client.rpc('analytics_summary', {'uid': self.user.id}).execute().data
+                if summary:
+                    metrics = summary.get('metrics', [])
+                    return {
+                        'total_usage': len(metrics),
+                        'agent_count': summary.get('agent_count', 0),
+                        'conversation_count': summary.get('conversation_count', 0),
+                        'metrics': metrics
+                    }
+            except Exception:
+                # RPC not installed yet; fall back to direct queries
+                pass
+
+            # Get usage metrics (skip the metadata blob)
+            response = self.client.table('usage_metrics').select('feature_used,usage_count,timestamp').eq('user_id', self.user.id).execute()
             metrics = response.data or []
-            
-            # Get agent count
-            agent_response = self.client.table('agent_configs').select('id').eq('user_id', self.user.id).execute()
-            agent_count = len(agent_response.data or [])
-            
-            # Get conversation count
-            conv_response = self.client.table('conversations').select('id').eq('user_id', self.user.id).execute()
-            conversation_count = len(conv_response.data or [])
-            
+
+            # Head requests with exact counts: the server returns the count
+            # without transferring any rows
+            agent_response = self.client.table('agent_configs').select('id', count='exact', head=True).eq('user_id', self.user.id).execute()
+            agent_count = agent_response.count or 0
+
+            conv_response = self.client.table('conversations').select('id', count='exact', head=True).eq('user_id', self.user.id).execute()
+            conversation_count = conv_response.count or 0
+
             return {
                 'total_usage': len(metrics),
                 'agent_count': agent_count,
@@ -312,9 +593,30 @@ class SupabaseManager:
             st.error(f"Error loading analytics: {e}")
             return {}
 
-def render_supabase_setup():
-    """Render Supabase connection setup interface"""
-    st.markdown("""
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_cloud_data_cached(user_id: str) -> Dict:
+    """Cloud-tab reads cached per user so reruns don't refetch.
+
+    Write paths (save/delete agent config) call .clear() to invalidate;
+    otherwise entries expire after the TTL.
+    """
+    return st.session_state.supabase_manager.fetch_cloud_data()
+
+@st.cache_data(show_spinner=False)
+def _pretty_config(cache_key: str, _config: Dict) -> str:
+    """Pretty-print an agent config, cached per (id, updated_at) key"""
+    if orjson is not None:
+        return orjson.dumps(_config, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(_config, indent=2)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_conversation_messages(conversation_id: str) -> List[Dict]:
+    """Per-conversation message bodies, cached so expanders don't refetch"""
+    return st.session_state.supabase_manager.get_conversation_messages(conversation_id)
+
+# Static HTML built once at import instead of on every rerun; only the
+# user card has an interpolated portion
+_SETUP_HEADER = """
     <div class="config-section">
         <h3 style="color: var(--text-main); margin-bottom: 1rem;">
             🗄️ <span class="gradient-text">Supabase Configuration</span>
@@ -323,7 +625,39 @@ def render_supabase_setup():
             Connect to Supabase for cloud storage, authentication, and real-time features
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+_AUTH_HEADER = """
+        <div class="config-section">
+            <h3 style="color: var(--text-main); margin-bottom: 1rem;">
+                🔐 <span class="gradient-text">Authentication</span>
+            </h3>
+        </div>
+        """
+
+_USER_CARD = Template("""
+    <div class="agent-card">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <h3 style="color: var(--text-main); margin: 0;">
+                    👋 Welcome, <span class="gradient-text">$email</span>
+                </h3>
+                <p style="color: var(--text-muted); margin: 0.5rem 0 0 0;">
+                    Connected to Supabase • Account verified
+                </p>
+            </div>
+            <div>
+                <span class="status-badge status-online">
+                    🟢 Online
+                </span>
+            </div>
+        </div>
+    </div>
+    """)
+
+def render_supabase_setup():
+    """Render Supabase connection setup interface"""
+    st.markdown(_SETUP_HEADER, unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
@@ -386,13 +720,7 @@ def render_supabase_auth():
     
     if not current_user:
         # Show login/signup interface
-        st.markdown("""
-        <div class="config-section">
-            <h3 style="color: var(--text-main); margin-bottom: 1rem;">
-                🔐 <span class="gradient-text">Authentication</span>
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_AUTH_HEADER, unsafe_allow_html=True)
         
         auth_tab1, auth_tab2 = st.tabs(["🔑 Sign In", "✨ Sign Up"])
         
@@ -444,25 +772,8 @@ def render_supabase_auth():
 
 def render_user_dashboard(supabase_manager: SupabaseManager, user):
     """Render user dashboard with Supabase data"""
-    st.markdown(f"""
-    <div class="agent-card">
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <div>
-                <h3 style="color: var(--text-main); margin: 0;">
-                    👋 Welcome, <span class="gradient-text">{user.email}</span>
-                </h3>
-                <p style="color: var(--text-muted); margin: 0.5rem 0 0 0;">
-                    Connected to Supabase • Account verified
-                </p>
-            </div>
-            <div>
-                <span class="status-badge status-online">
-                    🟢 Online
-                </span>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # Escape the email: it is user-controlled text inside raw HTML
+    st.markdown(_USER_CARD.substitute(email=escape(user.email)), unsafe_allow_html=True)
     
     # User analytics
     analytics = supabase_manager.get_user_analytics()
@@ -485,21 +796,26 @@ def render_user_dashboard(supabase_manager: SupabaseManager, user):
 
 def render_cloud_features():
     """Render cloud-enabled features"""
-    if 'supabase_manager' not in st.session_state or 'supabase_user' not in st.session_state:
+    if not _cloud_enabled():
         st.info("🔐 Sign in to access cloud features")
         return
     
     supabase_manager = st.session_state.supabase_manager
-    
+
+    # Report anything the background writers failed to save
+    drain_write_errors()
+
     st.markdown("### ☁️ Cloud Features")
-    
+
+    # One concurrent prefetch feeds all three tabs; cached across reruns
+    cloud_data = _fetch_cloud_data_cached(st.session_state.supabase_user.id)
+
     cloud_tab1, cloud_tab2, cloud_tab3 = st.tabs(["💾 Saved Agents", "💬 Conversations", "📈 Analytics"])
-    
+
     with cloud_tab1:
         st.markdown("#### 🤖 Your Saved Agents")
-        
-        # Load and display saved agents
-        saved_agents = supabase_manager.load_agent_configs()
+
+        saved_agents = cloud_data['agents']
         
         if saved_agents:
             for agent in saved_agents:
@@ -518,55 +834,72 @@ def render_cloud_features():
                     col1, col2, col3 = st.columns(3)
                     with col1:
                         if st.button(f"📥 Load {agent['agent_name']}", key=f"load_{agent['id']}"):
-                            st.session_state.current_agent_config = agent['config']
-                            st.success(f"✅ Loaded agent '{agent['agent_name']}'")
-                    
+                            config = supabase_manager.load_agent_config(agent['id'])
+                            if config is not None:
+                                st.session_state.current_agent_config = config
+                                st.success(f"✅ Loaded agent '{agent['agent_name']}'")
+
                     with col2:
                         if st.button("📋 Copy Config", key=f"copy_{agent['id']}"):
-                            st.code(json.dumps(agent['config'], indent=2), language='json')
+                            config = supabase_manager.load_agent_config(agent['id'])
+                            if config is not None:
+                                # updated_at changes on every re-save, so a
+                                # stale serialization can't outlive an edit
+                                cache_key = agent['id'] + (agent.get('updated_at')
+                                                           or agent.get('created_at', ''))
+                                st.code(_pretty_config(cache_key, config), language='json')
                     
                     with col3:
-                        if st.button("🗑️ Delete", key=f"delete_{agent['id']}"):
-                            if supabase_manager.delete_agent_config(agent['id']):
-                                st.success(f"✅ Deleted agent '{agent['agent_name']}'")
-                                st.rerun()
+                        st.checkbox("Select", key=f"select_{agent['id']}")
+
+            # One .in_() delete for however many agents are checked,
+            # instead of a round-trip per agent
+            selected_ids = [agent['id'] for agent in saved_agents
+                            if st.session_state.get(f"select_{agent['id']}")]
+            if selected_ids:
+                if st.button(f"🗑️ Delete selected ({len(selected_ids)})", type="primary"):
+                    if supabase_manager.delete_agent_configs(selected_ids):
+                        st.success(f"✅ Deleted {len(selected_ids)} agent(s)")
+                        st.rerun()
         else:
             st.info("No saved agents found. Create and save agents to see them here.")
     
     with cloud_tab2:
         st.markdown("#### 💬 Conversation History")
         
-        conversations = supabase_manager.get_conversations()
-        
+        # First page comes from the prefetch; extra pages accumulate in
+        # session state so "Load more" doesn't refetch earlier pages
+        conversations = cloud_data['conversations'] + st.session_state.setdefault('_conv_extra', [])
+
         if conversations:
-            for conv in conversations[:10]:  # Show last 10 conversations
+            for conv in conversations:
                 with st.expander(f"Conversation from {conv.get('created_at', 'Unknown')[:10]}"):
-                    messages = conv.get('messages', [])
+                    messages = _load_conversation_messages(conv['id'])
                     for msg in messages[-5:]:  # Show last 5 messages
                         if msg.get('role') == 'user':
                             st.markdown(f"**You:** {msg.get('content', '')}")
                         else:
                             st.markdown(f"**Agent:** {msg.get('content', '')}")
+
+            if st.button("📄 Load more", key="conv_load_more"):
+                more = supabase_manager.get_conversations(limit=10, offset=len(conversations))
+                if more:
+                    st.session_state['_conv_extra'].extend(more)
+                    st.rerun()
+                else:
+                    st.info("No more conversations.")
         else:
             st.info("No conversation history found.")
     
     with cloud_tab3:
         st.markdown("#### 📈 Usage Analytics")
         
-        analytics = supabase_manager.get_user_analytics()
-        
-        if analytics.get('metrics'):
-            # Feature usage chart
-            feature_usage = {}
-            for metric in analytics['metrics']:
-                feature = metric.get('feature_used', 'Unknown')
-                feature_usage[feature] = feature_usage.get(feature, 0) + metric.get('usage_count', 1)
-            
-            if feature_usage:
-                st.markdown("**Feature Usage:**")
-                for feature, count in feature_usage.items():
-                    st.metric(f"{feature}", count)
-        
+        feature_usage = cloud_data['feature_usage']
+
+        if feature_usage:
+            st.markdown("**Feature Usage:**")
+            for feature, count in feature_usage.items():
+                st.metric(f"{feature}", count)
         else:
             st.info("No analytics data available yet.")
 
@@ -588,6 +921,18 @@ CREATE TABLE IF NOT EXISTS agent_configs (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- One row per (user, agent name) so auto-save upserts instead of
+-- inserting a new row per edit
+CREATE UNIQUE INDEX IF NOT EXISTS agent_configs_user_name_uniq ON agent_configs(user_id, agent_name);
+
+-- All timestamps are stamped server-side: DEFAULT NOW() on insert,
+-- moddatetime on update (clients no longer send them)
+CREATE EXTENSION IF NOT EXISTS moddatetime;
+
+CREATE OR REPLACE TRIGGER set_agent_configs_updated_at
+    BEFORE UPDATE ON agent_configs
+    FOR EACH ROW EXECUTE FUNCTION moddatetime('updated_at');
+
 -- Conversations Table
 CREATE TABLE IF NOT EXISTS conversations (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -624,13 +969,52 @@ CREATE INDEX IF NOT EXISTS idx_conversations_user_id ON conversations(user_id);
 CREATE INDEX IF NOT EXISTS idx_usage_metrics_user_id ON usage_metrics(user_id);
 CREATE INDEX IF NOT EXISTS idx_usage_metrics_feature ON usage_metrics(feature_used);
 
+-- Composite indexes matching the dashboard's hot paths:
+-- "where user_id = ? order by created_at desc limit N" becomes a
+-- backward index scan instead of sort-after-scan
+CREATE INDEX IF NOT EXISTS idx_conv_user_created ON conversations(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_user_updated ON agent_configs(user_id, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_usage_user_feature ON usage_metrics(user_id, feature_used);
+
+-- Covering indexes: the list queries project only these columns, so the
+-- planner can answer them with index-only scans and never touch the
+-- heavy JSONB heap rows (verify Heap Fetches: 0 with EXPLAIN ANALYZE)
+CREATE INDEX IF NOT EXISTS idx_agent_list ON agent_configs (user_id, updated_at DESC) INCLUDE (id, agent_name);
+CREATE INDEX IF NOT EXISTS idx_conv_list ON conversations (user_id, created_at DESC) INCLUDE (id, agent_id);
+
+-- GIN indexes for containment queries on the JSONB columns
+CREATE INDEX IF NOT EXISTS idx_conv_metadata_gin ON conversations USING GIN (metadata jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_agent_config_gin ON agent_configs USING GIN (config jsonb_path_ops);
+
+-- Single round-trip analytics summary used by get_user_analytics()
+CREATE OR REPLACE FUNCTION analytics_summary(uid UUID) RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'agent_count', (SELECT COUNT(*) FROM agent_configs WHERE user_id = uid),
+        'conversation_count', (SELECT COUNT(*) FROM conversations WHERE user_id = uid),
+        'metrics', (SELECT COALESCE(jsonb_agg(u), '[]') FROM usage_metrics u WHERE user_id = uid)
+    );
+$$ LANGUAGE SQL STABLE SECURITY INVOKER;
+
+-- Server-side feature usage aggregation for the analytics tab
+CREATE OR REPLACE VIEW user_feature_usage WITH (security_invoker = true) AS
+    SELECT user_id, feature_used, SUM(usage_count)::INT AS total
+    FROM usage_metrics
+    GROUP BY user_id, feature_used;
+
 -- API Keys Table
 CREATE TABLE IF NOT EXISTS api_keys (
     user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE PRIMARY KEY,
     api_key TEXT NOT NULL,
+    api_key_sha TEXT,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS api_key_sha TEXT;
+
+CREATE OR REPLACE TRIGGER set_api_keys_updated_at
+    BEFORE UPDATE ON api_keys
+    FOR EACH ROW EXECUTE FUNCTION moddatetime('updated_at');
+
 -- API Keys RLS
 ALTER TABLE IF EXISTS api_keys ENABLE ROW LEVEL SECURITY;
 
@@ -664,33 +1048,53 @@ def init_supabase_session():
 
 # Auto-save functionality
     # Removed duplicate empty function definition
+def _cloud_enabled() -> bool:
+    """True when a connected manager and signed-in user are both present"""
+    return ('supabase_manager' in st.session_state and
+            'supabase_user' in st.session_state)
+
 def auto_save_agent_config(config: Dict):
     """Automatically save agent config to Supabase if connected"""
-    if ('supabase_manager' in st.session_state and
-        'supabase_user' in st.session_state and
-        config.get('name')):
+    if _cloud_enabled() and config.get('name'):
+        # Coalesce keystroke-driven reruns: at most one upsert per 2 s
+        if time.monotonic() - st.session_state.get('_last_autosave', 0.0) < 2.0:
+            return
+        st.session_state['_last_autosave'] = time.monotonic()
         supabase_manager = st.session_state.supabase_manager
         if supabase_manager.save_agent_config(config):
             st.toast("💾 Agent configuration auto-saved to cloud")
 
+# Usage events are buffered per session and flushed as one multi-row
+# insert, so a burst of feature taps costs one round-trip instead of N
+_USAGE_FLUSH_SIZE = 20
+_USAGE_FLUSH_SECONDS = 5.0
+
+def flush_usage_buffer():
+    """Flush buffered usage events as a single multi-row insert"""
+    buf = st.session_state.get('_usage_buffer')
+    if not buf or 'supabase_manager' not in st.session_state:
+        return
+    supabase_manager = st.session_state.supabase_manager
+    if supabase_manager.client:
+        # Off the script thread like the other writes
+        _get_io_pool().submit(supabase_manager._insert_rows, 'usage_metrics', list(buf))
+    buf.clear()
+    st.session_state['_usage_last_flush'] = time.monotonic()
+
 def track_feature_usage(feature_name: str, metadata: Optional[Dict] = None):
-    """Track feature usage in Supabase"""
-    if ('supabase_manager' in st.session_state and
-        'supabase_user' in st.session_state):
+    """Track feature usage in Supabase (buffered, flushed in batches)"""
+    if _cloud_enabled():
         supabase_manager = st.session_state.supabase_manager
-        metrics = {
-            'feature': feature_name,
-            'count': 1,
+        if not supabase_manager.user:
+            return
+        buf = st.session_state.setdefault('_usage_buffer', [])
+        buf.append({
+            'user_id': supabase_manager.user.id,
+            'feature_used': feature_name,
+            'usage_count': 1,
             'metadata': metadata or {}
-        }
-        supabase_manager.save_usage_metrics(metrics)
-    if ('supabase_manager' in st.session_state and 
-        'supabase_user' in st.session_state):
-        
-        supabase_manager = st.session_state.supabase_manager
-        metrics = {
-            'feature': feature_name,
-            'count': 1,
-            'metadata': metadata or {}
-        }
-        supabase_manager.save_usage_metrics(metrics)
+        })
+        last_flush = st.session_state.get('_usage_last_flush', 0.0)
+        if (len(buf) >= _USAGE_FLUSH_SIZE or
+                time.monotonic() - last_flush > _USAGE_FLUSH_SECONDS):
+            flush_usage_buffer()
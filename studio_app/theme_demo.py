@@ -5,37 +5,130 @@ This demonstrates the new Supabase-inspired dark theme for ElevenLabs Studio
 
 import streamlit as st
 
+# jinja2 ships in Streamlit's dependency tree, but keep the usual
+# optional-import guard so the module stays importable without it
+try:
+    from jinja2 import BaseLoader, Environment
+except ImportError:
+    Environment = None
 
-def show_theme_demo():
-    """Display a demo of the Supabase dark theme components"""
-    
-    st.markdown("# 🎨 Supabase Dark Theme Demo")
-    st.markdown("---")
-    
-    # Theme showcase
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
+
+class _FormatTemplate:
+    """Fallback with the same .render() surface, backed by str.format"""
+
+    def __init__(self, source: str):
+        self._source = source.replace('{{ ', '{').replace(' }}', '}')
+
+    def render(self, **kwargs) -> str:
+        return self._source.format(**kwargs)
+
+
+def _compile_template(source: str):
+    if Environment is not None:
+        return Environment(loader=BaseLoader()).from_string(source)
+    return _FormatTemplate(source)
+
+
+# The status and feature cards differ only in colors and text, so each
+# shape is one compiled template rendered per card at import time
+_STATUS_CARD_TMPL = _compile_template("""
+            <div style="background: {{ bg }}; border: 1px solid {{ color }};
+                        border-radius: 8px; padding: 1rem; text-align: center;">
+                <div style="color: {{ color }}; font-size: 1.5rem; margin-bottom: 0.5rem;">{{ icon }}</div>
+                <div style="color: {{ color }}; font-weight: 500;">{{ label }}</div>
+            </div>
+            """)
+
+_FEATURE_CARD_TMPL = _compile_template("""
+        <div style="background: var(--supabase-bg-alt); border: 1px solid var(--supabase-border);
+                    border-radius: 8px; padding: 1rem; margin-bottom: 0.5rem;">
+            <strong style="color: var(--supabase-text);">{{ title }}</strong>
+            <span style="color: var(--supabase-text-muted); margin-left: 1rem;">{{ description }}</span>
+        </div>
+        """)
+
+# Static HTML built once at import; every st.markdown call crosses the
+# frontend bridge and re-parses, so the demo emits each block exactly once
+_DARK_THEME_CARD = """
         <div class="feature-card glass-card">
             <h3><span class="gradient-text">🌙 Dark Theme Elements</span></h3>
             <p>Experience the modern Supabase-inspired design with:</p>
             <div style="margin-top: 1rem;">
-                <span style="background: rgba(62, 207, 142, 0.2); color: var(--supabase-green); 
+                <span style="background: rgba(62, 207, 142, 0.2); color: var(--supabase-green);
                              padding: 0.25rem 0.5rem; border-radius: 12px; font-size: 0.75rem; margin-right: 0.5rem;">
                     Glass morphism effects
                 </span>
-                <span style="background: rgba(62, 207, 142, 0.2); color: var(--supabase-green); 
+                <span style="background: rgba(62, 207, 142, 0.2); color: var(--supabase-green);
                              padding: 0.25rem 0.5rem; border-radius: 12px; font-size: 0.75rem; margin-right: 0.5rem;">
                     Gradient accents
                 </span>
-                <span style="background: rgba(62, 207, 142, 0.2); color: var(--supabase-green); 
+                <span style="background: rgba(62, 207, 142, 0.2); color: var(--supabase-green);
                              padding: 0.25rem 0.5rem; border-radius: 12px; font-size: 0.75rem;">
                     Smooth animations
                 </span>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+_AUDIO_PLAYER_CARD = """
+        <div class="audio-player glass-card">
+            <h4>🎵 Audio Player Component</h4>
+            <p style="color: var(--supabase-text-muted); font-size: 0.9rem;">
+                Enhanced audio player with glass morphism effects
+            </p>
+        </div>
+        """
+
+_STATUS_SPECS = (
+    # Literal green instead of var(--supabase-green): components.html
+    # renders in an iframe without the page's CSS variables
+    ("rgba(62, 207, 142, 0.1)", "#3ECF8E", "✅", "Connected"),
+    ("rgba(251, 191, 36, 0.1)", "#FBBF24", "⏳", "Processing"),
+    ("rgba(240, 82, 82, 0.1)", "#F05252", "❌", "Error"),
+)
+
+_STATUS_CARDS = tuple(
+    _STATUS_CARD_TMPL.render(bg=bg, color=color, icon=icon, label=label)
+    for bg, color, icon, label in _STATUS_SPECS
+)
+
+# All three indicators in one flex row, emitted as a single component
+# instead of st.columns(3) plus three st.markdown calls
+_STATUS_HTML = (
+    "<div style='display: flex; gap: 1rem; font-family: sans-serif;'>"
+    + "".join(f"<div style='flex: 1;'>{card}</div>" for card in _STATUS_CARDS)
+    + "</div>"
+)
+
+_FEATURES = [
+    ("🎨 Color Palette", "Supabase green (#3ECF8E) as primary with dark backgrounds"),
+    ("🔤 Typography", "Inter font family for modern, clean text"),
+    ("🪟 Glass Effects", "Translucent cards with backdrop blur"),
+    ("🌈 Gradients", "Subtle gradients for accent elements"),
+    ("⚡ Animations", "Smooth hover and transition effects"),
+    ("📱 Responsive", "Optimized for all screen sizes"),
+    ("🎯 Focus States", "Enhanced focus indicators for accessibility"),
+    ("🔄 Loading States", "Shimmer animations for loading content")
+]
+
+# All eight feature cards joined into a single emission
+_FEATURES_HTML = "\n".join(
+    _FEATURE_CARD_TMPL.render(title=icon_title, description=description)
+    for icon_title, description in _FEATURES
+)
+
+
+def show_theme_demo():
+    """Display a demo of the Supabase dark theme components"""
+    
+    st.markdown("# 🎨 Supabase Dark Theme Demo")
+    st.markdown("---")
+    
+    # Theme showcase
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(_DARK_THEME_CARD, unsafe_allow_html=True)
         
         # Interactive elements demo
         st.markdown("### 🎛️ Interactive Components")
@@ -44,46 +137,12 @@ def show_theme_demo():
         demo_select = st.selectbox("Dropdown", ["Option 1", "Option 2", "Option 3"])
         
     with col2:
-        st.markdown("""
-        <div class="audio-player glass-card">
-            <h4>🎵 Audio Player Component</h4>
-            <p style="color: var(--supabase-text-muted); font-size: 0.9rem;">
-                Enhanced audio player with glass morphism effects
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_AUDIO_PLAYER_CARD, unsafe_allow_html=True)
         
         # Status indicators
         st.markdown("### 📊 Status Indicators")
         
-        col_status1, col_status2, col_status3 = st.columns(3)
-        
-        with col_status1:
-            st.markdown("""
-            <div style="background: rgba(62, 207, 142, 0.1); border: 1px solid var(--supabase-green); 
-                        border-radius: 8px; padding: 1rem; text-align: center;">
-                <div style="color: var(--supabase-green); font-size: 1.5rem; margin-bottom: 0.5rem;">✅</div>
-                <div style="color: var(--supabase-green); font-weight: 500;">Connected</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_status2:
-            st.markdown("""
-            <div style="background: rgba(251, 191, 36, 0.1); border: 1px solid #FBBF24; 
-                        border-radius: 8px; padding: 1rem; text-align: center;">
-                <div style="color: #FBBF24; font-size: 1.5rem; margin-bottom: 0.5rem;">⏳</div>
-                <div style="color: #FBBF24; font-weight: 500;">Processing</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_status3:
-            st.markdown("""
-            <div style="background: rgba(240, 82, 82, 0.1); border: 1px solid #F05252; 
-                        border-radius: 8px; padding: 1rem; text-align: center;">
-                <div style="color: #F05252; font-size: 1.5rem; margin-bottom: 0.5rem;">❌</div>
-                <div style="color: #F05252; font-weight: 500;">Error</div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.components.v1.html(_STATUS_HTML, height=120)
     
     # Buttons demo
     st.markdown("### 🎯 Button Styles")
@@ -139,25 +198,7 @@ def show_theme_demo():
     st.markdown("---")
     st.markdown("## ✨ New Theme Features")
     
-    features = [
-        ("🎨 Color Palette", "Supabase green (#3ECF8E) as primary with dark backgrounds"),
-        ("🔤 Typography", "Inter font family for modern, clean text"),
-        ("🪟 Glass Effects", "Translucent cards with backdrop blur"),
-        ("🌈 Gradients", "Subtle gradients for accent elements"),
-        ("⚡ Animations", "Smooth hover and transition effects"),
-        ("📱 Responsive", "Optimized for all screen sizes"),
-        ("🎯 Focus States", "Enhanced focus indicators for accessibility"),
-        ("🔄 Loading States", "Shimmer animations for loading content")
-    ]
-    
-    for icon_title, description in features:
-        st.markdown(f"""
-        <div style="background: var(--supabase-bg-alt); border: 1px solid var(--supabase-border); 
-                    border-radius: 8px; padding: 1rem; margin-bottom: 0.5rem;">
-            <strong style="color: var(--supabase-text);">{icon_title}</strong>
-            <span style="color: var(--supabase-text-muted); margin-left: 1rem;">{description}</span>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(_FEATURES_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     show_theme_demo()
@@ -2,15 +2,70 @@
 Utility functions for ElevenLabs Studio App
 """
 
+from __future__ import annotations
+
 import base64
+import hashlib
 import os
 import tempfile
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional
 
 import streamlit as st
 
-from elevenlabs.client import ElevenLabs
-from elevenlabs.types import Model, Voice
+# The SDK types are only referenced in annotations (postponed via the
+# __future__ import above), so the heavy elevenlabs import chain is
+# skipped entirely at module load; streamlit must stay top-level because
+# the st.cache_* decorators below run at import time
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+    from elevenlabs.types import Model, Voice
+
+# Optional SIMD-accelerated base64; same API, several times faster on
+# large buffers
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+
+@lru_cache(maxsize=512)
+def safe_voice_filename(voice_id: str, name: str) -> str:
+    """Filesystem-safe voice name for download filenames, cached per voice"""
+    return name.replace(' ', '_')
+
+
+def _client_fingerprint(client: ElevenLabs) -> str:
+    """Digest of the client's API key, used as a stable cache key.
+
+    id(client) is not safe here: CPython reuses addresses after GC, so a
+    fresh client for a different key could be handed a stale entry. The
+    key digest survives client churn and changes exactly when the key does
+    (same scheme as the agent builder page's voice cache).
+    """
+    api_key = getattr(getattr(client, '_client_wrapper', None), '_api_key', None) or ''
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _fetch_voices(api_key_hash: str, _client: ElevenLabs) -> List[Voice]:
+    """Voice list fetched once per API key and reused across reruns.
+
+    api_key_hash is the hashable cache key; the client itself is passed
+    with a leading underscore so Streamlit doesn't try to hash it.
+    """
+    result = _client.voices.search()
+    return getattr(result, 'voices', [])
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _fetch_models(api_key_hash: str, _client: ElevenLabs) -> List[Model]:
+    """Model list fetched once per API key and reused across reruns"""
+    result = _client.models.list()
+    return getattr(result, 'models', [])
 
 
 class AudioUtils:
@@ -18,20 +73,56 @@ class AudioUtils:
     
     @staticmethod
     def audio_to_base64(audio_bytes: bytes) -> str:
-        """Convert audio bytes to base64 string"""
-        return base64.b64encode(audio_bytes).decode()
-    
+        """Convert audio bytes to base64 string.
+
+        Only for genuine serialization needs (JSON payloads, data URIs).
+        st.audio accepts raw bytes, so previews should never pay the
+        33% size overhead and encode pass of a base64 round-trip.
+        """
+        return _b64.b64encode(audio_bytes).decode()
+
     @staticmethod
     def base64_to_audio(base64_string: str) -> bytes:
         """Convert base64 string to audio bytes"""
-        return base64.b64decode(base64_string)
+        return _b64.b64decode(base64_string)
     
+    @staticmethod
+    def audio_iter_to_base64(chunks: Iterable[bytes]) -> str:
+        """Base64-encode streamed audio without an intermediate bytes copy.
+
+        Accumulates into a bytearray so peak memory is the audio plus the
+        encoded string, not audio twice plus the string as with joining
+        chunks into bytes first.
+        """
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+        return _b64.b64encode(buffer).decode()
+
     @staticmethod
     def save_temp_audio(audio_bytes: bytes, suffix: str = ".mp3") -> str:
-        """Save audio bytes to temporary file and return path"""
+        """Save audio bytes to temporary file and return path.
+
+        Only for handing audio to external tools that need a real file.
+        st.audio and st.download_button both accept bytes directly, so
+        in-app playback and downloads should skip the disk round-trip
+        (and the matching cleanup_temp_file call) entirely.
+        """
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
             tmp_file.write(audio_bytes)
             return tmp_file.name
+
+    @staticmethod
+    def save_temp_audio_stream(chunks: Iterable[bytes], suffix: str = ".mp3") -> str:
+        """Stream audio chunks to a temporary file and return its path.
+
+        Peak memory stays at one chunk, so multi-MB TTS outputs never have
+        to be materialized in RAM on the way to disk.
+        """
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            for chunk in chunks:
+                tmp_file.write(chunk)
+            return tmp_file.name
     
     @staticmethod
     def cleanup_temp_file(file_path: str):
@@ -48,78 +139,160 @@ class VoiceManager:
     def __init__(self, client: ElevenLabs):
         self.client = client
         self._voices_cache = None
+        self._voices_by_id = None
+        self._voice_soa = None
         self._models_cache = None
+        self._tts_models = None
+        self._vc_models = None
+        self._model_soa = None
+        self._category_cache = {}
+        # Hit/miss counters so the caching policy can be tuned with data
+        self._voices_hits = 0
+        self._voices_misses = 0
+        self._models_hits = 0
+        self._models_misses = 0
     
     def get_voices(self, force_refresh: bool = False) -> List[Voice]:
-        """Get available voices with caching and defensive checks"""
+        """Get available voices, served from the shared Streamlit cache.
+
+        Instances are rebuilt on every rerun, so the fetch lives behind
+        st.cache_resource rather than an instance attribute; the local
+        reference just avoids repeated cache lookups within one rerun.
+        """
         if self.client is None:
             st.error("ElevenLabs client is not initialized.")
             return []
-        if self._voices_cache is None or force_refresh:
+        if force_refresh:
+            _fetch_voices.clear()
+            self._voices_cache = None
+            self._voices_by_id = None
+            self._voice_soa = None
+            self._category_cache.clear()
+        if self._voices_cache is None:
+            self._voices_misses += 1
             try:
                 response = getattr(self.client, 'voices', None)
                 if response and hasattr(response, 'search'):
-                    result = response.search()
-                    self._voices_cache = getattr(result, 'voices', [])
+                    self._voices_cache = _fetch_voices(_client_fingerprint(self.client), self.client)
+                    # Id index built alongside the cache so lookups are O(1)
+                    self._voices_by_id = {v.voice_id: v for v in self._voices_cache}
+                    # Structure-of-arrays view for the selectbox: ids,
+                    # names and descriptions extracted once per fetch
+                    self._voice_soa = (
+                        tuple(v.voice_id for v in self._voices_cache),
+                        tuple(v.name for v in self._voices_cache),
+                        tuple((v.labels or {}).get('description', 'No description')
+                              for v in self._voices_cache),
+                    )
                 else:
                     st.error("Client 'voices' attribute or 'search' method not found.")
                     return []
             except Exception as e:
                 st.error(f"Error fetching voices: {str(e)}")
                 return []
+        else:
+            self._voices_hits += 1
         return self._voices_cache or []
-    
+
     def get_models(self, force_refresh: bool = False) -> List[Model]:
-        """Get available models with caching and defensive checks"""
+        """Get available models, served from the shared Streamlit cache"""
         if self.client is None:
             st.error("ElevenLabs client is not initialized.")
             return []
-        if self._models_cache is None or force_refresh:
+        if force_refresh:
+            _fetch_models.clear()
+            self._models_cache = None
+            self._tts_models = None
+            self._vc_models = None
+            self._model_soa = None
+        if self._models_cache is None:
+            self._models_misses += 1
             try:
                 response = getattr(self.client, 'models', None)
                 if response and hasattr(response, 'list'):
-                    result = response.list()
-                    self._models_cache = getattr(result, 'models', [])
+                    self._models_cache = _fetch_models(_client_fingerprint(self.client), self.client)
+                    # Capability lists built once here so the per-feature
+                    # getters are plain returns
+                    self._tts_models = [m for m in self._models_cache
+                                        if getattr(m, 'can_do_text_to_speech', False)]
+                    self._vc_models = [m for m in self._models_cache
+                                       if getattr(m, 'can_do_voice_conversion', False)]
+                    self._model_soa = (
+                        tuple(m.model_id for m in self._models_cache),
+                        tuple(m.name for m in self._models_cache),
+                        tuple(m.description for m in self._models_cache),
+                    )
                 else:
                     st.error("Client 'models' attribute or 'list' method not found.")
                     return []
             except Exception as e:
                 st.error(f"Error fetching models: {str(e)}")
                 return []
+        else:
+            self._models_hits += 1
         return self._models_cache or []
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counts for the voice and model caches"""
+        return {
+            'voices': {'hits': self._voices_hits, 'misses': self._voices_misses},
+            'models': {'hits': self._models_hits, 'misses': self._models_misses},
+        }
     
+    def get_voice_soa(self) -> Optional[tuple]:
+        """(ids, names, descriptions) tuples for selectbox rendering"""
+        self.get_voices()
+        return self._voice_soa
+
+    def get_model_soa(self) -> Optional[tuple]:
+        """(ids, names, descriptions) tuples for selectbox rendering"""
+        self.get_models()
+        return self._model_soa
+
     def get_voice_by_id(self, voice_id: str) -> Optional[Voice]:
-        """Get voice by ID"""
-        voices = self.get_voices()
-        for voice in voices:
-            if voice.voice_id == voice_id:
-                return voice
-        return None
+        """Get voice by ID via the dict index instead of a linear scan"""
+        self.get_voices()  # ensure the cache and index are populated
+        return (self._voices_by_id or {}).get(voice_id)
     
+    def iter_voices_by_category(self, category: str):
+        """Lazily yield voices matching a category.
+
+        Callers that only need the first K matches (paged dropdowns) can
+        itertools.islice this and stop scanning early instead of building
+        the full filtered list.
+        """
+        # Check the label values directly instead of stringifying and
+        # lowercasing the whole labels dict for every voice
+        needle = category.lower()
+        for voice in self.get_voices():
+            if voice.labels and any(needle in str(value).lower()
+                                    for value in voice.labels.values()):
+                yield voice
+
     def get_voices_by_category(self, category: str = None) -> List[Voice]:
-        """Get voices filtered by category"""
+        """Get voices filtered by category, memoized per category"""
         voices = self.get_voices()
         if not category:
             return voices
-        
-        # Filter voices by category/labels
-        filtered_voices = []
-        for voice in voices:
-            if voice.labels and category.lower() in str(voice.labels).lower():
-                filtered_voices.append(voice)
+
+        needle = category.lower()
+        cached = self._category_cache.get(needle)
+        if cached is not None:
+            return cached
+
+        filtered_voices = list(self.iter_voices_by_category(category))
+        self._category_cache[needle] = filtered_voices
         return filtered_voices
     
     def get_tts_models(self) -> List[Model]:
         """Get models that support text-to-speech"""
-        models = self.get_models()
-        return [model for model in models 
-                if hasattr(model, 'can_do_text_to_speech') and model.can_do_text_to_speech]
-    
+        self.get_models()  # ensure the capability lists are populated
+        return self._tts_models or []
+
     def get_voice_conversion_models(self) -> List[Model]:
         """Get models that support voice conversion"""
-        models = self.get_models()
-        return [model for model in models 
-                if hasattr(model, 'can_do_voice_conversion') and model.can_do_voice_conversion]
+        self.get_models()
+        return self._vc_models or []
 
 
 class SessionManager:
@@ -136,7 +309,9 @@ class SessionManager:
             'current_voice': None,
             'current_model': None,
             'chat_messages': [],
-            'audio_history': [],
+            # Ring buffer: appends past the cap evict the oldest entry in
+            # O(1) instead of re-slicing a list
+            'audio_history': deque(maxlen=10),
             'user_preferences': {
                 'theme': 'light',
                 'default_voice': None,
@@ -151,15 +326,11 @@ class SessionManager:
     
     @staticmethod
     def save_audio_to_history(audio_data: Dict[str, Any]):
-        """Save generated audio to history"""
+        """Save generated audio to history (deque evicts past 10 items)"""
         if 'audio_history' not in st.session_state:
-            st.session_state.audio_history = []
-        
+            st.session_state.audio_history = deque(maxlen=10)
+
         st.session_state.audio_history.append(audio_data)
-        
-        # Keep only last 10 items
-        if len(st.session_state.audio_history) > 10:
-            st.session_state.audio_history = st.session_state.audio_history[-10:]
     
     @staticmethod
     def get_user_preference(key: str, default: Any = None) -> Any:
@@ -174,49 +345,80 @@ class SessionManager:
         st.session_state.user_preferences[key] = value
 
 
+@st.cache_data(show_spinner=False)
+def _option_labels(ids: tuple, names: tuple, descriptions: tuple) -> Dict[str, str]:
+    """Display labels keyed by id, built once per distinct option set"""
+    return {opt_id: f"{name} - {description}"
+            for opt_id, name, description in zip(ids, names, descriptions)}
+
+
 class UIComponents:
     """Reusable UI components"""
-    
+
     @staticmethod
-    def render_voice_selector(voices: List[Voice], key: str = "voice_selector") -> Optional[Voice]:
-        """Render voice selection dropdown"""
+    def render_voice_selector(voices: List[Voice], key: str = "voice_selector",
+                              soa: Optional[tuple] = None) -> Optional[Voice]:
+        """Render voice selection dropdown.
+
+        Pass VoiceManager.get_voice_soa() as `soa` to skip the per-voice
+        attribute extraction on every rerun.
+        """
         if not voices:
             st.warning("No voices available")
             return None
-        
-        voice_options = {}
-        for voice in voices:
-            description = "No description"
-            if voice.labels and 'description' in voice.labels:
-                description = voice.labels['description']
-            voice_options[f"{voice.name} - {description}"] = voice
-        
-        selected_voice_name = st.selectbox(
+
+        # Options are voice ids; the formatted labels come from a cached
+        # map instead of being rebuilt (and scanned) every rerun
+        if soa is None:
+            soa = (
+                tuple(voice.voice_id for voice in voices),
+                tuple(voice.name for voice in voices),
+                tuple((voice.labels or {}).get('description', 'No description')
+                      for voice in voices),
+            )
+        ids, names, descriptions = soa
+        labels = _option_labels(ids, names, descriptions)
+        by_id = dict(zip(ids, voices))
+
+        selected_id = st.selectbox(
             "Select Voice",
-            list(voice_options.keys()),
+            list(by_id),
+            format_func=labels.__getitem__,
             key=key
         )
-        
-        return voice_options[selected_voice_name] if selected_voice_name else None
-    
+
+        return by_id.get(selected_id)
+
     @staticmethod
-    def render_model_selector(models: List[Model], key: str = "model_selector") -> Optional[Model]:
-        """Render model selection dropdown"""
+    def render_model_selector(models: List[Model], key: str = "model_selector",
+                              soa: Optional[tuple] = None) -> Optional[Model]:
+        """Render model selection dropdown.
+
+        Pass VoiceManager.get_model_soa() as `soa` to skip the per-model
+        attribute extraction on every rerun.
+        """
         if not models:
             st.warning("No models available")
             return None
-        
-        model_options = {}
-        for model in models:
-            model_options[f"{model.name} - {model.description}"] = model
-        
-        selected_model_name = st.selectbox(
+
+        if soa is None:
+            soa = (
+                tuple(model.model_id for model in models),
+                tuple(model.name for model in models),
+                tuple(model.description for model in models),
+            )
+        ids, names, descriptions = soa
+        labels = _option_labels(ids, names, descriptions)
+        by_id = dict(zip(ids, models))
+
+        selected_id = st.selectbox(
             "Select Model",
-            list(model_options.keys()),
+            list(by_id),
+            format_func=labels.__getitem__,
             key=key
         )
-        
-        return model_options[selected_model_name] if selected_model_name else None
+
+        return by_id.get(selected_id)
     
     @staticmethod
     def render_audio_player(audio_bytes: bytes, title: str = "Generated Audio"):
@@ -225,14 +427,20 @@ class UIComponents:
         st.audio(audio_bytes, format='audio/mp3')
     
     @staticmethod
-    def render_feature_card(title: str, description: str, icon: str = "🔧"):
-        """Render a feature card"""
-        st.markdown(f"""
+    @lru_cache(maxsize=256)
+    def _card_html(title: str, description: str, icon: str) -> str:
+        """Feature-card HTML memoized per (title, description, icon)"""
+        return f"""
         <div class="feature-card">
             <h3>{icon} {title}</h3>
             <p>{description}</p>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+    @staticmethod
+    def render_feature_card(title: str, description: str, icon: str = "🔧"):
+        """Render a feature card"""
+        st.markdown(UIComponents._card_html(title, description, icon), unsafe_allow_html=True)
     
     @staticmethod
     def render_metrics_row(metrics: Dict[str, Any]):
@@ -250,19 +458,78 @@ class UIComponents:
                     st.metric(label, value)
 
     @staticmethod
-    def render_section_header(title: str, description: str):
-        """Render a consistent section header"""
-        st.markdown(f"""
+    @lru_cache(maxsize=64)
+    def _section_header_html(title: str, description: str) -> str:
+        """Section-header HTML memoized per (title, description)"""
+        return f"""
         <div class="section-header">
             <h2>{title}</h2>
             <p>{description}</p>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+    @staticmethod
+    def render_section_header(title: str, description: str):
+        """Render a consistent section header"""
+        st.markdown(UIComponents._section_header_html(title, description), unsafe_allow_html=True)
+
+
+# Typed, immutable view of the configuration: attribute access instead of
+# chained string-keyed lookups, and no per-call copying
+@dataclass(frozen=True)
+class AppCfg:
+    title: str
+    version: str
+    debug: bool
+
+
+@dataclass(frozen=True)
+class ModelsCfg:
+    tts: Mapping[str, str]
+    asr: Mapping[str, str]
+
+
+@dataclass(frozen=True)
+class DefaultsCfg:
+    voice_id: str
+    model_id: str
+    language: str
+
+
+@dataclass(frozen=True)
+class AudioCfg:
+    default_format: str
+    quality_presets: Mapping[str, str]
+
+
+@dataclass(frozen=True)
+class VoiceSettingsCfg:
+    stability: float
+    similarity_boost: float
+    style: float
+    use_speaker_boost: bool
+
+
+@dataclass(frozen=True)
+class LimitsCfg:
+    max_text_length: int
+    max_file_size_mb: int
+    max_batch_size: int
+
+
+@dataclass(frozen=True)
+class StudioCfg:
+    app: AppCfg
+    models: ModelsCfg
+    defaults: DefaultsCfg
+    audio: AudioCfg
+    voice_settings: VoiceSettingsCfg
+    limits: LimitsCfg
 
 
 class ConfigManager:
     """Manage application configuration"""
-    
+
     DEFAULT_CONFIG = {
         'app': {
             'title': 'ElevenLabs Studio',
@@ -309,77 +576,103 @@ class ConfigManager:
         }
     }
     
+    # Read-only view shared by every caller; the old per-call .copy() was
+    # shallow anyway, so it never protected the nested dicts
+    _FROZEN = MappingProxyType(DEFAULT_CONFIG)
+
+    # The same configuration as a frozen dataclass tree, built once at
+    # import, for typed attribute access on the hot accessors
+    CONFIG = StudioCfg(
+        app=AppCfg(**DEFAULT_CONFIG['app']),
+        models=ModelsCfg(
+            tts=MappingProxyType(DEFAULT_CONFIG['models']['tts']),
+            asr=MappingProxyType(DEFAULT_CONFIG['models']['asr']),
+        ),
+        defaults=DefaultsCfg(**DEFAULT_CONFIG['defaults']),
+        audio=AudioCfg(
+            default_format=DEFAULT_CONFIG['audio']['default_format'],
+            quality_presets=MappingProxyType(DEFAULT_CONFIG['audio']['quality_presets']),
+        ),
+        voice_settings=VoiceSettingsCfg(**DEFAULT_CONFIG['voice_settings']),
+        limits=LimitsCfg(**DEFAULT_CONFIG['limits']),
+    )
+
     @classmethod
     def get_config(cls) -> Dict[str, Any]:
-        """Get application configuration"""
+        """Get application configuration (read-only view)"""
         # In a real app, this would load from a config file
-        return cls.DEFAULT_CONFIG.copy()
-    
+        return cls._FROZEN
+
     @classmethod
-    def get_audio_formats(cls) -> List[str]:
+    @lru_cache(maxsize=1)
+    def get_audio_formats(cls) -> tuple:
         """Get available audio formats"""
-        config = cls.get_config()
-        return list(config['audio']['quality_presets'].values())
-    
+        return tuple(cls.CONFIG.audio.quality_presets.values())
+
     @classmethod
     def get_quality_preset(cls, preset: str) -> str:
         """Get audio format for quality preset"""
-        config = cls.get_config()
-        return config['audio']['quality_presets'].get(preset, 'mp3_44100_128')
+        return cls.CONFIG.audio.quality_presets.get(preset, 'mp3_44100_128')
+
+
+_ALLOWED_AUDIO_TYPES = frozenset({'audio/mpeg', 'audio/wav', 'audio/flac', 'audio/m4a'})
+_MAX_AUDIO_BYTES = 25 * 1024 * 1024
 
 
 class ValidationUtils:
     """Validation utilities"""
-    
+
     @staticmethod
     def validate_text_length(text: str, max_length: int = 5000) -> bool:
         """Validate text length"""
         return len(text) <= max_length
-    
+
     @staticmethod
     def validate_api_key(api_key: str) -> bool:
         """Basic API key validation"""
         return bool(api_key and len(api_key) > 10)
-    
+
     @staticmethod
     def validate_audio_file(file) -> bool:
         """Validate uploaded audio file"""
         if not file:
             return False
-        
+
         # Check file size (25MB limit)
-        if file.size > 25 * 1024 * 1024:
+        if file.size > _MAX_AUDIO_BYTES:
             st.error("File size exceeds 25MB limit")
             return False
-        
+
         # Check file type
-        allowed_types = ['audio/mpeg', 'audio/wav', 'audio/flac', 'audio/m4a']
-        if file.type not in allowed_types:
+        if file.type not in _ALLOWED_AUDIO_TYPES:
             st.error(f"Unsupported file type: {file.type}")
             return False
-        
+
         return True
 
 
 class ErrorHandler:
     """Error handling utilities"""
-    
+
+    # Common error patterns, checked in order against one lowercased copy
+    _PATTERNS = (
+        ("unauthorized", "🔑 API key is invalid or expired. Please check your credentials."),
+        ("quota", "💳 You've exceeded your API quota. Please upgrade your plan."),
+        ("rate limit", "⏱️ Rate limit exceeded. Please wait a moment before trying again."),
+        ("network", "🌐 Network error. Please check your internet connection."),
+    )
+
     @staticmethod
     def handle_api_error(error: Exception, context: str = "API call"):
         """Handle and display API errors"""
         error_msg = str(error)
-        
-        # Common error patterns
-        if "unauthorized" in error_msg.lower():
-            st.error("🔑 API key is invalid or expired. Please check your credentials.")
-        elif "quota" in error_msg.lower():
-            st.error("💳 You've exceeded your API quota. Please upgrade your plan.")
-        elif "rate limit" in error_msg.lower():
-            st.error("⏱️ Rate limit exceeded. Please wait a moment before trying again.")
-        elif "network" in error_msg.lower():
-            st.error("🌐 Network error. Please check your internet connection.")
-        else:
-            st.error(f"❌ Error in {context}: {error_msg}")
+        lowered = error_msg.lower()
+
+        for pattern, message in ErrorHandler._PATTERNS:
+            if pattern in lowered:
+                st.error(message)
+                return
+        st.error(f"❌ Error in {context}: {error_msg}")
     
     @staticmethod
     def safe_execute(func, *args, **kwargs):